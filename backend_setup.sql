@@ -100,12 +100,16 @@ CREATE TABLE IF NOT EXISTS episodic_memory (
     created_at  timestamptz NOT NULL DEFAULT now()
 );
 
+-- Index for the nightly consolidation scan (agent + recent window).
+CREATE INDEX IF NOT EXISTS idx_episodic_memory_agent_time
+    ON episodic_memory(agent_id, created_at DESC);
+
 -- Semantic Memory — Vector embeddings for similarity search (Transcripts, corrections, etc.)
 CREATE TABLE IF NOT EXISTS semantic_memory (
     id          uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
     agent_id    uuid NOT NULL REFERENCES agents(id) ON DELETE CASCADE,
     content     text NOT NULL,
-    embedding   vector(1536),
+    embedding   halfvec(384),   -- native all-MiniLM-L6-v2 size, half precision
     metadata    jsonb NOT NULL DEFAULT '{}'::jsonb,
     owner       text NOT NULL DEFAULT 'company'
                 CHECK (owner IN ('expert', 'company')),
@@ -114,7 +118,7 @@ CREATE TABLE IF NOT EXISTS semantic_memory (
 
 CREATE INDEX IF NOT EXISTS idx_semantic_memory_agent_owner ON semantic_memory(agent_id, owner);
 CREATE INDEX IF NOT EXISTS idx_semantic_memory_embedding
-    ON semantic_memory USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+    ON semantic_memory USING ivfflat (embedding halfvec_cosine_ops) WITH (lists = 100);
 
 -- Working Context — Short-term agent state.
 CREATE TABLE IF NOT EXISTS working_context (
@@ -0,0 +1,15 @@
+-- 005_judgment_indexes.sql
+-- Indexes for the Python judgment service's hot queries.
+
+-- ============================================================
+-- Episodic Memory — nightly consolidation scan
+-- Consolidator.run_consolidation reads one agent's episodes from the
+-- last 24 hours, newest first. The index finds that window and returns
+-- it already ordered, so the scan needs no sort; the selected columns are
+-- read from the heap. summary and outcome are unbounded text, so they are
+-- deliberately not INCLUDEd: a long summary would exceed the btree row
+-- size limit and fail the INSERT.
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS idx_episodic_memory_agent_time
+    ON episodic_memory(agent_id, created_at DESC);
@@ -0,0 +1,22 @@
+-- 006_semantic_halfvec.sql
+-- Store semantic memory embeddings at the embedding model's native size
+-- in half precision. Requires pgvector 0.7+ (halfvec, subvector).
+
+-- ============================================================
+-- Semantic Memory — vector(1536) → halfvec(384)
+-- all-MiniLM-L6-v2 produces 384-dim vectors; the judgment service used to
+-- zero-pad them to 1536, so the first 384 components hold the whole
+-- embedding. halfvec(384) is 768 bytes per row instead of 6 KB, and the
+-- similarity scan reads 8× less data.
+-- ============================================================
+
+DROP INDEX IF EXISTS idx_semantic_memory_embedding;
+
+ALTER TABLE semantic_memory
+    ALTER COLUMN embedding TYPE halfvec(384)
+    USING subvector(embedding, 1, 384)::halfvec(384);
+
+CREATE INDEX IF NOT EXISTS idx_semantic_memory_embedding
+    ON semantic_memory
+    USING ivfflat (embedding halfvec_cosine_ops)
+    WITH (lists = 100);
@@ -17,13 +17,23 @@ Endpoints:
   POST /consolidation/run             — trigger nightly dream event
 """
 
+import asyncio
+import logging
 import os
 import hashlib
+import queue
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
+from hmac import compare_digest
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
-from fastapi import FastAPI, Header, HTTPException, status
-from pydantic import BaseModel, Field
+import orjson
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from ..db.supabase import db
 from ..memory.core import CoreMemory
@@ -46,7 +56,7 @@ class JudgmentPattern(BaseModel):
     domains: list[str] = []
     confidence: float = 0.0
 
-    model_config = {"populate_by_name": True}
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class Trigger(BaseModel):
@@ -80,7 +90,7 @@ class ExpertJudgment(BaseModel):
     hard_constraints: list[Constraint] = Field(alias="hardConstraints", default=[])
     confidence_map: list[ConfidenceRange] = Field(alias="confidenceMap", default=[])
 
-    model_config = {"populate_by_name": True}
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class Decision(BaseModel):
@@ -95,7 +105,7 @@ class Decision(BaseModel):
     outcome: Optional[str] = None
     tags: list[str] = []
 
-    model_config = {"populate_by_name": True}
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class Person(BaseModel):
@@ -105,7 +115,7 @@ class Person(BaseModel):
     relevance: str = ""
     contact_preference: Optional[str] = Field(alias="contactPreference", default=None)
 
-    model_config = {"populate_by_name": True}
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class EpisodicEvent(BaseModel):
@@ -116,7 +126,7 @@ class EpisodicEvent(BaseModel):
     sentiment: float = 0.0
     relevance_score: float = Field(alias="relevanceScore", default=0.0)
 
-    model_config = {"populate_by_name": True}
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class ActiveContextSnapshot(BaseModel):
@@ -124,7 +134,7 @@ class ActiveContextSnapshot(BaseModel):
     open_questions: list[dict] = Field(alias="openQuestions", default=[])
     active_experiments: list[dict] = Field(alias="activeExperiments", default=[])
 
-    model_config = {"populate_by_name": True}
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class OrgContext(BaseModel):
@@ -137,7 +147,7 @@ class OrgContext(BaseModel):
     active_context: Optional[ActiveContextSnapshot] = Field(alias="activeContext", default=None)
     optimization_mode: str = Field(alias="optimizationMode", default="balanced")
 
-    model_config = {"populate_by_name": True}
+    model_config = ConfigDict(populate_by_name=True)
 
 
 # ============================================================
@@ -258,33 +268,127 @@ class VersionDiffResponse(BaseModel):
 # ============================================================
 
 SERVICE_TOKEN = os.getenv("SERVICE_TOKEN", "")
+_SERVICE_TOKEN_BYTES = SERVICE_TOKEN.encode()
 
 
-def verify_token(x_service_token: str = Header(...)):
-    """Verify the X-Service-Token header."""
+def verify_token(x_service_token: str = Header(...)) -> None:
+    """
+    Verify the X-Service-Token header.
+
+    Used as a route dependency so FastAPI resolves the header once per request.
+    The comparison is constant-time to avoid leaking the token through timing.
+    """
     if not SERVICE_TOKEN:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="SERVICE_TOKEN not configured on server",
         )
-    if x_service_token != SERVICE_TOKEN:
+    if not compare_digest(x_service_token.encode(), _SERVICE_TOKEN_BYTES):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid service token",
         )
 
 
+# ============================================================
+# Request body parsing
+# ============================================================
+
+
+def json_body(model: type[BaseModel]):
+    """
+    Dependency that validates the raw request body straight into `model`.
+
+    model_validate_json parses the JSON inside pydantic-core (Rust), skipping
+    the json.loads → dict → validate round trip FastAPI does for body params.
+    Validation failures still surface as the usual 422 response.
+    """
+
+    async def parse(request: Request) -> BaseModel:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            errors = [
+                {**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)
+            ]
+            raise RequestValidationError(errors) from e
+
+    return parse
+
+
+# Request models read through json_body(), registered as OpenAPI components
+# by _openapi(); FastAPI only collects models it sees as body parameters
+_JSON_BODY_MODELS: dict[str, type[BaseModel]] = {}
+_COMPONENT_REF = "#/components/schemas/{model}"
+
+
+def json_body_openapi(model: type[BaseModel]) -> dict:
+    """OpenAPI requestBody for routes that read their body through json_body()."""
+    _JSON_BODY_MODELS[model.__name__] = model
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": _COMPONENT_REF.format(model=model.__name__)}
+                }
+            },
+        }
+    }
+
+
 # ============================================================
 # FastAPI App
 # ============================================================
 
-app = FastAPI(
-    title="Only Reason — Judgment Service",
-    version="0.1.0",
-    description="Expert training, memory encoding, and judgment retrieval for the Only Reason agent runtime.",
-)
 
-# Module instances — initialized on startup
+class FastORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, including numpy scalars/arrays.
+
+    Similarity scores and embeddings may arrive as numpy types; without
+    OPT_SERIALIZE_NUMPY they would fall back to jsonable_encoder.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+        )
+
+
+# ============================================================
+# Logging
+# ============================================================
+
+logger = logging.getLogger(__name__)
+
+# Every module logs under the top-level package logger, e.g. "src.memory.core"
+_PACKAGE_LOGGER = logging.getLogger(__name__.split(".")[0])
+_LOG_LEVELS = {"debug": logging.DEBUG, "info": logging.INFO, "warn": logging.WARNING, "error": logging.ERROR}
+
+
+def _start_logging() -> QueueListener:
+    """
+    Route service logs through a queue so request handlers never block on I/O.
+
+    Handlers only enqueue records; a QueueListener thread formats and writes
+    them to stderr. Level comes from LOG_LEVEL (debug | info | warn | error).
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+
+    _PACKAGE_LOGGER.addHandler(QueueHandler(log_queue))
+    _PACKAGE_LOGGER.setLevel(_LOG_LEVELS.get(os.getenv("LOG_LEVEL", "info").lower(), logging.INFO))
+    _PACKAGE_LOGGER.propagate = False
+
+    listener = QueueListener(log_queue, stream)
+    listener.start()
+    return listener
+
+
+# Module instances — initialized in lifespan()
 core_memory = CoreMemory()
 semantic_memory = SemanticMemory()
 training_handler = TrainingSessionHandler()
@@ -292,41 +396,98 @@ envelope_builder = EnvelopeBuilder()
 consolidator = Consolidator()
 
 
-@app.on_event("startup")
-async def startup():
-    """Initialize database connection and modules on startup."""
-    await db.connect()
-    await semantic_memory.initialize()
-    print("[JudgmentService] Started successfully")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize database connection and modules on startup, clean up on shutdown."""
+    log_listener = _start_logging()
+    try:
+        await db.connect()
+        await semantic_memory.initialize()
+        logger.info("Started successfully")
+
+        yield
+    finally:
+        # Runs even if startup or serving raised; disconnect is a no-op
+        # when the pool was never created
+        await db.disconnect()
+        logger.info("Shut down")
+        log_listener.stop()
+        _PACKAGE_LOGGER.handlers.clear()
+
+
+app = FastAPI(
+    title="Only Reason — Judgment Service",
+    version="0.1.0",
+    description="Expert training, memory encoding, and judgment retrieval for the Only Reason agent runtime.",
+    default_response_class=FastORJSONResponse,
+    lifespan=lifespan,
+)
+
+
+def _openapi() -> dict:
+    """
+    OpenAPI document with the json_body() request models in components.
+
+    Each model's schema is generated with component refs, and any nested
+    models ($defs) are merged into components alongside it.
+    """
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        components = schema.setdefault("components", {}).setdefault("schemas", {})
+        for name, model in _JSON_BODY_MODELS.items():
+            model_schema = model.model_json_schema(ref_template=_COMPONENT_REF)
+            for def_name, definition in model_schema.pop("$defs", {}).items():
+                components.setdefault(def_name, definition)
+            components.setdefault(name, model_schema)
+    return app.openapi_schema
+
+
+app.openapi = _openapi
 
 
-@app.on_event("shutdown")
-async def shutdown():
-    """Clean up on shutdown."""
-    await db.disconnect()
-    print("[JudgmentService] Shut down")
+# Last database health probe, reused by /health for HEALTH_CHECK_TTL seconds
+HEALTH_CHECK_TTL = 1.0
+_health_state = {"ok": False, "ts": float("-inf")}
 
 
 # ============================================================
 # Endpoints
 # ============================================================
+#
+# Responses are built with model_construct(): their values come from the
+# database or from already-validated requests, so validating them again
+# on construction is wasted work.
 
 
 @app.get("/health", response_model=HealthResponse)
 async def health():
-    """Returns service status and version."""
-    db_ok = await db.health_check()
-    return HealthResponse(
+    """
+    Returns service status and version.
+
+    The database probe is cached for HEALTH_CHECK_TTL seconds so a burst of
+    load-balancer probes costs one round trip instead of one per hit.
+    """
+    now = time.monotonic()
+    if now - _health_state["ts"] < HEALTH_CHECK_TTL:
+        db_ok = _health_state["ok"]
+    else:
+        db_ok = await db.health_check()
+        _health_state.update(ok=db_ok, ts=now)
+    return HealthResponse.model_construct(
         status="healthy" if db_ok else "degraded",
         version="0.1.0",
         database_connected=db_ok,
     )
 
 
-@app.post("/envelope/build", response_model=EnvelopeBuildResponse)
+@app.post(
+    "/envelope/build",
+    response_model=EnvelopeBuildResponse,
+    openapi_extra=json_body_openapi(EnvelopeBuildRequest),
+)
 async def build_envelope(
-    request: EnvelopeBuildRequest,
-    x_service_token: str = Header(...),
+    request: EnvelopeBuildRequest = Depends(json_body(EnvelopeBuildRequest)),
+    _: None = Depends(verify_token),
 ):
     """
     Build the expert judgment portion of a TaskEnvelope.
@@ -338,8 +499,6 @@ async def build_envelope(
     3. Query org knowledge graph for company_id
     4. Assemble and return the judgment object
     """
-    verify_token(x_service_token)
-
     result = await envelope_builder.build(
         agent_id=request.agent_id,
         task_spec=request.task_spec,
@@ -351,10 +510,14 @@ async def build_envelope(
     return result
 
 
-@app.post("/training/session", response_model=TrainingSessionResponse)
+@app.post(
+    "/training/session",
+    response_model=TrainingSessionResponse,
+    openapi_extra=json_body_openapi(TrainingSessionRequest),
+)
 async def training_session(
-    request: TrainingSessionRequest,
-    x_service_token: str = Header(...),
+    request: TrainingSessionRequest = Depends(json_body(TrainingSessionRequest)),
+    _: None = Depends(verify_token),
 ):
     """
     Ingest a training session transcript.
@@ -362,8 +525,6 @@ async def training_session(
     Extracts judgment patterns from the transcript and writes
     them to core_memory. This is the training ingestion endpoint.
     """
-    verify_token(x_service_token)
-
     result = await training_handler.process_session(
         agent_id=request.agent_id,
         expert_id=request.expert_id,
@@ -379,63 +540,60 @@ async def training_session(
 @app.post("/memory/semantic/search", response_model=SemanticSearchResponse)
 async def semantic_search(
     request: SemanticSearchRequest,
-    x_service_token: str = Header(...),
+    _: None = Depends(verify_token),
 ):
     """
     Semantic similarity search using pgvector cosine similarity.
-    """
-    verify_token(x_service_token)
 
+    Results from semantic_memory.search already match SemanticSearchResult,
+    so they are serialized directly instead of being re-validated.
+    """
     results = await semantic_memory.search(
         agent_id=request.agent_id,
         query=request.query,
         limit=request.limit,
     )
 
-    return SemanticSearchResponse(results=results)
+    return FastORJSONResponse({"results": results})
 
 
 @app.post("/memory/semantic/write", response_model=SemanticWriteResponse)
 async def semantic_write(
     request: SemanticWriteRequest,
-    x_service_token: str = Header(...),
+    _: None = Depends(verify_token),
 ):
     """
     Write a semantic memory entry. Generates embedding and stores in pgvector.
     """
-    verify_token(x_service_token)
-
     memory_id = await semantic_memory.write(
         agent_id=request.agent_id,
         content=request.content,
         metadata=request.metadata,
     )
 
-    return SemanticWriteResponse(id=memory_id, success=True)
+    return SemanticWriteResponse.model_construct(id=memory_id, success=True)
 
 
 @app.get("/training/status/{agent_id}", response_model=TrainingStatusResponse)
 async def training_status(
     agent_id: str,
-    x_service_token: str = Header(...),
+    _: None = Depends(verify_token),
 ):
     """
     Returns whether an agent has completed training, training version hash,
     and last training date.
     """
-    verify_token(x_service_token)
-
-    cm = await core_memory.load(agent_id)
+    summary = await core_memory.load_summary(agent_id)
 
-    if cm is None:
-        return TrainingStatusResponse(trained=False)
+    if summary is None:
+        return TrainingStatusResponse.model_construct(trained=False)
 
-    return TrainingStatusResponse(
+    return TrainingStatusResponse.model_construct(
         trained=True,
-        training_version=cm.get("training_version", ""),
-        last_training_date=cm.get("created_at", ""),
-        pattern_count=len(cm.get("judgment_json", {}).get("patterns", [])),
-        constraint_count=len(cm.get("hard_constraints", [])),
+        training_version=summary["training_version"],
+        last_training_date=summary["created_at"],
+        pattern_count=summary["pattern_count"],
+        constraint_count=summary["constraint_count"],
     )
 
 
@@ -447,7 +605,7 @@ async def training_status(
 @app.post("/training/correction", response_model=CorrectionResponse)
 async def training_correction(
     request: CorrectionRequest,
-    x_service_token: str = Header(...),
+    _: None = Depends(verify_token),
 ):
     """
     Receive a correction from the approval gate.
@@ -456,8 +614,6 @@ async def training_correction(
     this endpoint records it as a training signal that can be
     incorporated into the next training version.
     """
-    verify_token(x_service_token)
-
     # Store correction as semantic memory for retrieval during next training
     correction_metadata = {
         "type": "correction",
@@ -472,12 +628,11 @@ async def training_correction(
         metadata=correction_metadata,
     )
 
-    print(
-        f"[JudgmentService] Correction recorded for agent {request.agent_id}, "
-        f"task {request.task_id}"
+    logger.info(
+        "Correction recorded for agent %s, task %s", request.agent_id, request.task_id
     )
 
-    return CorrectionResponse(
+    return CorrectionResponse.model_construct(
         success=True,
         message="Correction recorded as training signal",
         incorporated=False,  # Will be incorporated in next training version
@@ -492,7 +647,7 @@ async def training_correction(
 @app.post("/consolidation/run", response_model=ConsolidationResponse)
 async def run_consolidation(
     request: ConsolidationRequest,
-    x_service_token: str = Header(...),
+    _: None = Depends(verify_token),
 ):
     """
     Trigger the nightly consolidation (dream event) for an agent.
@@ -504,13 +659,11 @@ async def run_consolidation(
     4. Generates a morning note summarizing insights
     5. Prunes low-relevance memories
     """
-    verify_token(x_service_token)
-
-    # Run consolidation
-    consolidation_result = await consolidator.run_consolidation(request.agent_id)
-
-    # Run drift detection
-    drift_result = await consolidator.detect_drift(request.agent_id)
+    # Consolidation and drift detection read disjoint tables — run them concurrently
+    consolidation_result, drift_result = await asyncio.gather(
+        consolidator.run_consolidation(request.agent_id),
+        consolidator.detect_drift(request.agent_id),
+    )
 
     # Generate morning note
     morning_note = await consolidator.generate_morning_note(
@@ -519,7 +672,7 @@ async def run_consolidation(
         drift_result,
     )
 
-    return ConsolidationResponse(
+    return ConsolidationResponse.model_construct(
         agent_id=request.agent_id,
         episodes_reviewed=consolidation_result.get("episodes_reviewed", 0),
         patterns_found=consolidation_result.get("patterns_found", 0),
@@ -540,7 +693,7 @@ async def training_version_diff(
     agent_id: str,
     version_a: str = "current",
     version_b: str = "latest",
-    x_service_token: str = Header(...),
+    _: None = Depends(verify_token),
 ):
     """
     Diff two training versions so the company can decide when to adopt.
@@ -549,10 +702,8 @@ async def training_version_diff(
     (new patterns, removed patterns, changed constraints) and choose
     when to adopt the new version.
     """
-    verify_token(x_service_token)
-
     # Load both versions from core_memory
-    cm = await core_memory.load(agent_id)
+    cm = await core_memory.load_summary(agent_id)
     if cm is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -563,11 +714,9 @@ async def training_version_diff(
     # This requires versioned storage of core_memory snapshots.
     # For now, return a stub diff.
 
-    current_version = cm.get("training_version", "")
-    current_patterns = cm.get("judgment_json", {}).get("patterns", [])
-    current_constraints = cm.get("hard_constraints", [])
+    current_version = cm["training_version"]
 
-    return VersionDiffResponse(
+    return VersionDiffResponse.model_construct(
         agent_id=agent_id,
         version_a=version_a if version_a != "current" else current_version,
         version_b=version_b if version_b != "latest" else current_version,
@@ -576,7 +725,7 @@ async def training_version_diff(
         changed_constraints=[],
         summary=(
             f"Agent {agent_id} at version {current_version}: "
-            f"{len(current_patterns)} patterns, {len(current_constraints)} constraints. "
+            f"{cm['pattern_count']} patterns, {cm['constraint_count']} constraints. "
             "Version diffing will be available when versioned core_memory storage is implemented."
         ),
     )
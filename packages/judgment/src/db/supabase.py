@@ -5,10 +5,65 @@ Uses asyncpg for direct Postgres/pgvector access.
 All database operations go through this module.
 """
 
+import logging
 import os
+import struct
 import asyncpg
+import numpy as np
+import orjson
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+# pgvector binary wire format: int16 dimension, int16 unused, then
+# big-endian float32 (vector) or float16 (halfvec) components.
+_VECTOR_HEADER = struct.Struct(">HH")
+
+
+def _encode_vector(value) -> bytes:
+    """Encode a sequence or ndarray of floats as a binary pgvector value."""
+    vec = np.asarray(value, dtype=">f4")
+    return _VECTOR_HEADER.pack(vec.shape[0], 0) + vec.tobytes()
+
+
+def _decode_vector(data: bytes) -> np.ndarray:
+    """Decode a binary pgvector value into a float32 ndarray."""
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=_VECTOR_HEADER.size).astype(
+        np.float32
+    )
+
+
+def _encode_halfvec(value) -> bytes:
+    """Encode a sequence or ndarray of floats as a binary pgvector halfvec value."""
+    vec = np.asarray(value, dtype=">f2")
+    return _VECTOR_HEADER.pack(vec.shape[0], 0) + vec.tobytes()
+
+
+def _decode_halfvec(data: bytes) -> np.ndarray:
+    """Decode a binary pgvector halfvec value into a float32 ndarray."""
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=">f2", count=dim, offset=_VECTOR_HEADER.size).astype(
+        np.float32
+    )
+
+
+def _encode_jsonb(value) -> bytes:
+    """
+    Encode a value as binary jsonb (version byte 1 + JSON text).
+
+    Bytes are taken as already-serialized JSON so callers that hash the
+    encoded document can pass it through without a second dumps.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return b"\x01" + bytes(value)
+    return b"\x01" + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes):
+    """Decode a binary jsonb value, skipping the version byte."""
+    return orjson.loads(data[1:])
+
 
 class Database:
     """Async Postgres database client using asyncpg."""
@@ -24,20 +79,76 @@ class Database:
                 "DATABASE_URL is not set. Provide it via constructor or environment variable."
             )
 
+        # Sized for bursty nightly consolidation, which fans out several queries
+        # per agent. Idle connections are recycled after 5 minutes.
+        # asyncpg caches prepared statements per connection keyed by query
+        # text, which is why callers keep their SQL as module-level constants:
+        # each query is parsed and planned once per connection, and the larger
+        # cache keeps every hot query prepared.
         self._pool = await asyncpg.create_pool(
             self.database_url,
-            min_size=2,
-            max_size=10,
+            min_size=4,
+            max_size=32,
+            max_inactive_connection_lifetime=300,
+            statement_cache_size=256,
             command_timeout=30,
+            init=self._init_connection,
         )
-        print("[Database] Connection pool created")
+        logger.info("Connection pool created")
+
+    async def _init_connection(self, conn: asyncpg.Connection) -> None:
+        """
+        Register binary codecs on each new pool connection.
+
+        With the vector/halfvec codecs, embeddings are bound as raw float32
+        or float16 bytes instead of being formatted into "[v1,v2,...]" text
+        literals, and come back as float32 ndarrays. With
+        the jsonb codec, jsonb columns are read and written as Python
+        objects, decoded by orjson instead of handed back as strings.
+        """
+        await conn.set_type_codec(
+            "jsonb",
+            schema="pg_catalog",
+            encoder=_encode_jsonb,
+            decoder=_decode_jsonb,
+            format="binary",
+        )
+
+        rows = await conn.fetch(
+            """
+            SELECT t.typname, n.nspname
+            FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace
+            WHERE t.typname IN ('vector', 'halfvec')
+            """
+        )
+        schemas = {row["typname"]: row["nspname"] for row in rows}
+        if "vector" not in schemas:
+            logger.warning("pgvector type not found; vector codecs not registered")
+            return
+
+        await conn.set_type_codec(
+            "vector",
+            schema=schemas["vector"],
+            encoder=_encode_vector,
+            decoder=_decode_vector,
+            format="binary",
+        )
+        # halfvec ships with pgvector 0.7+
+        if "halfvec" in schemas:
+            await conn.set_type_codec(
+                "halfvec",
+                schema=schemas["halfvec"],
+                encoder=_encode_halfvec,
+                decoder=_decode_halfvec,
+                format="binary",
+            )
 
     async def disconnect(self) -> None:
         """Close the connection pool."""
         if self._pool:
             await self._pool.close()
             self._pool = None
-            print("[Database] Connection pool closed")
+            logger.info("Connection pool closed")
 
     @property
     def pool(self) -> asyncpg.Pool:
@@ -58,18 +169,33 @@ class Database:
         async with self.pool.acquire() as conn:
             return await conn.fetch(query, *args)
 
+    async def fetch_val(self, query: str, *args, column: int = 0):
+        """Fetch a single value from the first row."""
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(query, *args, column=column)
+
     async def execute(self, query: str, *args) -> str:
         """Execute a query (INSERT, UPDATE, DELETE)."""
         async with self.pool.acquire() as conn:
             return await conn.execute(query, *args)
 
+    async def execute_many(self, query: str, args: list[tuple]) -> None:
+        """Execute a query once per argument tuple, atomically, in a single round trip."""
+        async with self.pool.acquire() as conn:
+            await conn.executemany(query, args)
+
+    async def copy_records(self, table: str, records: list[tuple], columns: list[str]) -> str:
+        """Bulk-load rows into a table with binary COPY (atomic, one round trip)."""
+        async with self.pool.acquire() as conn:
+            return await conn.copy_records_to_table(table, records=records, columns=columns)
+
     async def health_check(self) -> bool:
         """Verify the database connection is healthy."""
         try:
             row = await self.fetch_one("SELECT 1 AS ok")
             return row is not None and row["ok"] == 1
         except Exception as e:
-            print(f"[Database] Health check failed: {e}")
+            logger.warning("Health check failed: %s", e)
             return False
 
 
@@ -10,9 +10,44 @@ In production, this runs as a scheduled job that:
 6. Generates a morning note for the company
 """
 
+import logging
+import uuid
 from datetime import datetime, timezone, timedelta
+
+import numpy as np
 from ..db.supabase import db
 
+logger = logging.getLogger(__name__)
+
+_UTC = timezone.utc
+_ONE_DAY = timedelta(days=1)  # consolidation window
+_ONE_WEEK = timedelta(days=7)  # drift detection window
+
+# Served by idx_episodic_memory_agent_time (see 005_judgment_indexes.sql).
+# summary, outcome, sentiment lead the select list so rows can be read
+# positionally in _summarize_episodes.
+RECENT_EPISODES_SQL = """
+    SELECT summary, outcome, sentiment, created_at
+    FROM episodic_memory
+    WHERE agent_id = $1 AND created_at >= $2
+    ORDER BY created_at DESC
+"""
+
+# Same scan for a batch of agents in one round trip (nightly cron)
+RECENT_EPISODES_MANY_SQL = """
+    SELECT summary, outcome, sentiment, agent_id, created_at
+    FROM episodic_memory
+    WHERE agent_id = ANY($1::uuid[]) AND created_at >= $2
+    ORDER BY created_at DESC
+"""
+
+# Fixed morning-note fragments
+_QUIET_DAY_NOTE = (
+    "Good morning. Agent {} had a quiet day yesterday — "
+    "no tasks were processed. Ready for today's assignments."
+)
+_ALL_NORMAL_NOTE = " All systems operating within trained parameters."
+
 
 class Consolidator:
     """Nightly memory consolidation (dream event)."""
@@ -31,26 +66,47 @@ class Consolidator:
 
         Returns a summary of what was consolidated.
         """
-        print(f"[Consolidator] Running consolidation for agent {agent_id}")
+        logger.info("Running consolidation for agent %s", agent_id)
 
         # Fetch recent episodic memories
-        yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+        yesterday = datetime.now(_UTC) - _ONE_DAY
 
-        rows = await db.fetch_all(
-            """
-            SELECT id, session_id, summary, outcome, sentiment, created_at
-            FROM episodic_memory
-            WHERE agent_id = $1 AND created_at >= $2
-            ORDER BY created_at DESC
-            """,
-            agent_id,
-            yesterday,
-        )
+        rows = await db.fetch_all(RECENT_EPISODES_SQL, agent_id, yesterday)
+
+        return self._summarize_episodes(agent_id, rows)
+
+    async def run_many(self, agent_ids: list[str]) -> dict[str, dict]:
+        """
+        Run consolidation for a batch of agents with a single episodic query.
+
+        Used by the scheduled nightly job instead of calling run_consolidation
+        once per agent. Returns a mapping of agent_id to the same summary dict
+        run_consolidation produces, keyed by canonical (lowercase, hyphenated)
+        UUID strings.
+        """
+        logger.info("Running consolidation for %d agents", len(agent_ids))
 
+        # Canonical form, so the caller's IDs match str(row["agent_id"])
+        agent_ids = [str(uuid.UUID(agent_id)) for agent_id in agent_ids]
+        yesterday = datetime.now(_UTC) - _ONE_DAY
+
+        rows = await db.fetch_all(RECENT_EPISODES_MANY_SQL, agent_ids, yesterday)
+
+        rows_by_agent: dict[str, list] = {agent_id: [] for agent_id in agent_ids}
+        for row in rows:
+            rows_by_agent.setdefault(str(row["agent_id"]), []).append(row)
+
+        return {
+            agent_id: self._summarize_episodes(agent_id, agent_rows)
+            for agent_id, agent_rows in rows_by_agent.items()
+        }
+
+    def _summarize_episodes(self, agent_id: str, rows: list) -> dict:
+        """Build the consolidation summary for one agent's recent episodes."""
         episode_count = len(rows)
 
         if episode_count == 0:
-            print(f"[Consolidator] No recent episodes for agent {agent_id}")
+            logger.info("No recent episodes for agent %s", agent_id)
             return {
                 "agent_id": agent_id,
                 "episodes_reviewed": 0,
@@ -62,11 +118,7 @@ class Consolidator:
 
         # Extract episode data for morning note generation
         episodes = [
-            {
-                "summary": row.get("summary", ""),
-                "outcome": row.get("outcome", ""),
-                "sentiment": row.get("sentiment", 0.0),
-            }
+            {"summary": row[0], "outcome": row[1], "sentiment": row[2]}
             for row in rows
         ]
 
@@ -76,9 +128,7 @@ class Consolidator:
         # - Drift detection against core memory
         # - Memory pruning based on relevance decay
 
-        print(
-            f"[Consolidator] Reviewed {episode_count} episodes for agent {agent_id}"
-        )
+        logger.info("Reviewed %d episodes for agent %s", episode_count, agent_id)
 
         return {
             "agent_id": agent_id,
@@ -101,36 +151,24 @@ class Consolidator:
         Returns drift metrics.
         """
         # Fetch recent telemetry to compare against baseline
-        one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+        one_week_ago = datetime.now(_UTC) - _ONE_WEEK
 
-        escalation_rows = await db.fetch_all(
+        # Both counts come from a single scan of telemetry_events
+        row = await db.fetch_one(
             """
-            SELECT COUNT(*) as count
+            SELECT COUNT(*) FILTER (WHERE event_type = 'escalation') AS escalation_count,
+                   COUNT(*) FILTER (WHERE event_type = 'task_completed') AS task_count
             FROM telemetry_events
             WHERE agent_id = $1
-              AND event_type = 'escalation'
+              AND event_type IN ('escalation', 'task_completed')
               AND created_at >= $2
             """,
             agent_id,
             one_week_ago,
         )
 
-        task_rows = await db.fetch_all(
-            """
-            SELECT COUNT(*) as count
-            FROM telemetry_events
-            WHERE agent_id = $1
-              AND event_type = 'task_completed'
-              AND created_at >= $2
-            """,
-            agent_id,
-            one_week_ago,
-        )
-
-        escalation_count = (
-            escalation_rows[0].get("count", 0) if escalation_rows else 0
-        )
-        task_count = task_rows[0].get("count", 0) if task_rows else 0
+        escalation_count = row["escalation_count"] if row else 0
+        task_count = row["task_count"] if row else 0
 
         # Calculate escalation rate
         escalation_rate = (
@@ -178,21 +216,20 @@ class Consolidator:
         episodes = consolidation_result.get("episodes", [])
 
         if episodes_reviewed == 0:
-            return (
-                f"Good morning. Agent {agent_id} had a quiet day yesterday — "
-                "no tasks were processed. Ready for today's assignments."
-            )
+            return _QUIET_DAY_NOTE.format(agent_id)
 
         # Summarize episode themes
-        positive = sum(1 for ep in episodes if ep.get("sentiment", 0) > 0.5)
-        negative = sum(1 for ep in episodes if ep.get("sentiment", 0) < -0.2)
+        sentiments = np.fromiter(
+            (ep.get("sentiment") or 0.0 for ep in episodes),
+            dtype=np.float32,
+            count=len(episodes),
+        )
+        positive = int((sentiments > 0.5).sum())
+        negative = int((sentiments < -0.2).sum())
         neutral = episodes_reviewed - positive - negative
 
-        # Build the morning note
-        parts = [
-            f"Good morning. Yesterday I processed {episodes_reviewed} sessions",
-        ]
-
+        # Only the non-default fragments need formatting
+        breakdown = ""
         if positive > 0 or negative > 0:
             sentiment_parts = []
             if positive > 0:
@@ -201,23 +238,25 @@ class Consolidator:
                 sentiment_parts.append(f"{negative} challenging")
             if neutral > 0:
                 sentiment_parts.append(f"{neutral} routine")
-            parts.append(f" ({', '.join(sentiment_parts)})")
-
-        parts.append(".")
+            breakdown = f" ({', '.join(sentiment_parts)})"
 
-        if patterns_found > 0:
-            parts.append(
-                f" I identified {patterns_found} recurring patterns worth noting."
-            )
+        patterns_note = (
+            f" I identified {patterns_found} recurring patterns worth noting."
+            if patterns_found > 0
+            else ""
+        )
 
         if drift_detected:
-            parts.append(
+            status_note = (
                 f" ⚠️ Behavioral drift detected (score: {drift_score:.2f}, "
                 f"escalation rate: {escalation_rate:.1%}). "
                 "I recommend reviewing my recent decisions."
             )
         else:
-            parts.append(" All systems operating within trained parameters.")
+            status_note = _ALL_NORMAL_NOTE
 
-        return "".join(parts)
+        return (
+            f"Good morning. Yesterday I processed {episodes_reviewed} sessions"
+            f"{breakdown}.{patterns_note}{status_note}"
+        )
 
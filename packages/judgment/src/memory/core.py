@@ -8,13 +8,102 @@ IMPORTANT: Only the training service writes to this table.
 Agent runtime processes must treat it as read-only.
 """
 
-import json
+import asyncio
 import hashlib
+import logging
 from datetime import datetime, timezone
 from typing import Optional
 
+import orjson
+
 from ..db.supabase import db
 
+logger = logging.getLogger(__name__)
+
+# BLAKE3 hashes large judgment blobs with SIMD across lanes; fall back to
+# SHA-256 where the package is unavailable (development installs).
+try:
+    from blake3 import blake3 as _version_hasher
+except ImportError:
+    _version_hasher = hashlib.sha256
+
+# Combined patterns + constraints + triggers at which write() encodes on a
+# worker thread (~0.5 ms of encoding, 10× the thread hand-off cost)
+OFFLOAD_ITEM_COUNT = 1000
+
+LOAD_SQL = """
+    SELECT id, agent_id, expert_id, training_version,
+           judgment_json, hard_constraints, escalation_triggers,
+           confidence_map, created_at, locked_at
+    FROM core_memory
+    WHERE agent_id = $1
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+INSERT_SQL = """
+    INSERT INTO core_memory (
+        agent_id, expert_id, training_version,
+        judgment_json, hard_constraints, escalation_triggers,
+        confidence_map, created_at, locked_at
+    ) VALUES ($1, $2, $3, $4::jsonb, $5::jsonb, $6::jsonb, $7::jsonb, $8, $9)
+"""
+
+LOAD_SUMMARY_SQL = """
+    SELECT training_version, created_at,
+           CASE WHEN jsonb_typeof(judgment_json->'patterns') = 'array'
+                THEN jsonb_array_length(judgment_json->'patterns')
+                ELSE 0 END AS pattern_count,
+           CASE WHEN jsonb_typeof(hard_constraints) = 'array'
+                THEN jsonb_array_length(hard_constraints)
+                ELSE 0 END AS constraint_count
+    FROM core_memory
+    WHERE agent_id = $1
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+VERSION_SQL = """
+    SELECT training_version FROM core_memory
+    WHERE agent_id = $1
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+
+def _encode_fields(
+    judgment_json: dict,
+    hard_constraints: list,
+    escalation_triggers: list,
+    confidence_map: list,
+) -> tuple[bytes, bytes, bytes, bytes, str]:
+    """
+    Serialize the core memory fields and derive their training version hash.
+
+    Returns the four encoded fields and the 16-hex-char version hash.
+    """
+    # Serialize each field once; the same bytes feed the hash and, via the
+    # jsonb codec, the INSERT
+    judgment = orjson.dumps(judgment_json, option=orjson.OPT_SORT_KEYS)
+    constraints = orjson.dumps(hard_constraints, option=orjson.OPT_SORT_KEYS)
+    triggers = orjson.dumps(escalation_triggers, option=orjson.OPT_SORT_KEYS)
+    confidence = orjson.dumps(confidence_map, option=orjson.OPT_SORT_KEYS)
+
+    # Generate training version hash over the key-sorted combined document
+    # {"confidence":…,"constraints":…,"judgment":…,"triggers":…}
+    digest = _version_hasher()
+    digest.update(b'{"confidence":')
+    digest.update(confidence)
+    digest.update(b',"constraints":')
+    digest.update(constraints)
+    digest.update(b',"judgment":')
+    digest.update(judgment)
+    digest.update(b',"triggers":')
+    digest.update(triggers)
+    digest.update(b"}")
+    version_hash = digest.hexdigest()[:16]
+    return judgment, constraints, triggers, confidence, version_hash
+
 
 class CoreMemory:
     """Read/write operations for the core_memory table."""
@@ -24,18 +113,7 @@ class CoreMemory:
         Load the latest core memory for an agent.
         Returns None if no core memory exists.
         """
-        row = await db.fetch_one(
-            """
-            SELECT id, agent_id, expert_id, training_version,
-                   judgment_json, hard_constraints, escalation_triggers,
-                   confidence_map, created_at, locked_at
-            FROM core_memory
-            WHERE agent_id = $1
-            ORDER BY created_at DESC
-            LIMIT 1
-            """,
-            agent_id,
-        )
+        row = await db.fetch_one(LOAD_SQL, agent_id)
 
         if row is None:
             return None
@@ -45,18 +123,10 @@ class CoreMemory:
             "agent_id": str(row["agent_id"]),
             "expert_id": str(row["expert_id"]),
             "training_version": row["training_version"],
-            "judgment_json": json.loads(row["judgment_json"])
-            if isinstance(row["judgment_json"], str)
-            else row["judgment_json"],
-            "hard_constraints": json.loads(row["hard_constraints"])
-            if isinstance(row["hard_constraints"], str)
-            else row["hard_constraints"],
-            "escalation_triggers": json.loads(row["escalation_triggers"])
-            if isinstance(row["escalation_triggers"], str)
-            else row["escalation_triggers"],
-            "confidence_map": json.loads(row["confidence_map"])
-            if isinstance(row["confidence_map"], str)
-            else row["confidence_map"],
+            "judgment_json": row["judgment_json"],
+            "hard_constraints": row["hard_constraints"],
+            "escalation_triggers": row["escalation_triggers"],
+            "confidence_map": row["confidence_map"],
             "created_at": row["created_at"].isoformat()
             if row["created_at"]
             else None,
@@ -79,54 +149,62 @@ class CoreMemory:
         Generates a training version hash from the content.
         Returns the training version hash.
         """
-        # Generate training version hash
-        content = json.dumps(
-            {
-                "judgment": judgment_json,
-                "constraints": hard_constraints,
-                "triggers": escalation_triggers,
-                "confidence": confidence_map,
-            },
-            sort_keys=True,
+        # Encoding holds the event loop; only large blobs are worth the hop
+        # to a worker thread
+        item_count = (
+            len(judgment_json.get("patterns", ()))
+            + len(hard_constraints)
+            + len(escalation_triggers)
         )
-        version_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
+        if item_count >= OFFLOAD_ITEM_COUNT:
+            encoded = await asyncio.to_thread(
+                _encode_fields, judgment_json, hard_constraints, escalation_triggers, confidence_map
+            )
+        else:
+            encoded = _encode_fields(
+                judgment_json, hard_constraints, escalation_triggers, confidence_map
+            )
+        judgment, constraints, triggers, confidence, version_hash = encoded
 
         now = datetime.now(timezone.utc)
 
         await db.execute(
-            """
-            INSERT INTO core_memory (
-                agent_id, expert_id, training_version,
-                judgment_json, hard_constraints, escalation_triggers,
-                confidence_map, created_at, locked_at
-            ) VALUES ($1, $2, $3, $4::jsonb, $5::jsonb, $6::jsonb, $7::jsonb, $8, $9)
-            """,
+            INSERT_SQL,
             agent_id,
             expert_id,
             version_hash,
-            json.dumps(judgment_json),
-            json.dumps(hard_constraints),
-            json.dumps(escalation_triggers),
-            json.dumps(confidence_map),
+            judgment,
+            constraints,
+            triggers,
+            confidence,
             now,
             now,  # locked immediately
         )
 
-        print(
-            f"[CoreMemory] Wrote core memory for agent {agent_id}, "
-            f"version: {version_hash}"
-        )
+        logger.info("Wrote core memory for agent %s, version: %s", agent_id, version_hash)
         return version_hash
 
+    async def load_summary(self, agent_id: str) -> Optional[dict]:
+        """
+        Load the latest training version and pattern/constraint counts.
+
+        The counts are computed by Postgres, so the judgment blobs are never
+        shipped or decoded. Returns None if no core memory exists.
+        """
+        row = await db.fetch_one(LOAD_SUMMARY_SQL, agent_id)
+
+        if row is None:
+            return None
+
+        return {
+            "training_version": row["training_version"],
+            "created_at": row["created_at"].isoformat()
+            if row["created_at"]
+            else None,
+            "pattern_count": row["pattern_count"],
+            "constraint_count": row["constraint_count"],
+        }
+
     async def get_version(self, agent_id: str) -> Optional[str]:
         """Get the current training version hash for an agent."""
-        row = await db.fetch_one(
-            """
-            SELECT training_version FROM core_memory
-            WHERE agent_id = $1
-            ORDER BY created_at DESC
-            LIMIT 1
-            """,
-            agent_id,
-        )
-        return row["training_version"] if row else None
+        return await db.fetch_val(VERSION_SQL, agent_id)
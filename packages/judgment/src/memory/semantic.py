@@ -5,53 +5,264 @@ Generates embeddings using sentence-transformers and stores them
 in the semantic_memory table with pgvector for cosine similarity search.
 """
 
-import json
+import hashlib
+import logging
+import os
 import uuid
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Optional
 
 import numpy as np
 from ..db.supabase import db
 
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of embeddings kept in memory (queries and written content)
+EMBED_CACHE_SIZE = 16384
+
+# Texts per forward pass when embedding in bulk
+EMBED_BATCH_SIZE = 32
+
+# int8 dynamically quantized export (AVX-512 VNNI kernels), shipped in the
+# sentence-transformers model repos under onnx/
+ONNX_QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Dimension of the semantic_memory.embedding column (halfvec(384), the
+# native all-MiniLM-L6-v2 size); also the fallback vector size
+EMBEDDING_DIM = 384
+
+# Batches at least this large are written with binary COPY instead of executemany
+COPY_THRESHOLD = 500
+
+INSERT_COLUMNS = ["id", "agent_id", "content", "embedding", "metadata", "owner"]
+
+INSERT_SQL = """
+    INSERT INTO semantic_memory (id, agent_id, content, embedding, metadata, owner)
+    VALUES ($1, $2, $3, $4::halfvec, $5::jsonb, $6)
+"""
+
+# Similarity search, without and with an owner filter
+SEARCH_SQL = """
+    SELECT id, content, metadata,
+           1 - (embedding <=> $1::halfvec) AS similarity
+    FROM semantic_memory
+    WHERE agent_id = $2
+    ORDER BY embedding <=> $1::halfvec
+    LIMIT $3
+"""
+
+SEARCH_OWNER_SQL = """
+    SELECT id, content, metadata,
+           1 - (embedding <=> $1::halfvec) AS similarity
+    FROM semantic_memory
+    WHERE agent_id = $2 AND owner = $3
+    ORDER BY embedding <=> $1::halfvec
+    LIMIT $4
+"""
+
 
 class SemanticMemory:
     """Semantic memory operations using pgvector."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", backend: Optional[str] = None):
         self._model_name = model_name
+        # "torch" (default) or "onnx" (ONNX Runtime, int8-quantized on CPU)
+        self._backend = backend or os.getenv("EMBEDDING_BACKEND", "torch")
         self._model = None  # Lazy load
+        # Native model embedding size, replaced once the model is loaded
+        self._dim = EMBEDDING_DIM
+        # Model embeddings keyed by a hash of the embedded text, LRU order
+        self._emb_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
 
     async def initialize(self) -> None:
         """Initialize the embedding model. Called on server startup."""
         try:
             from sentence_transformers import SentenceTransformer
 
-            self._model = SentenceTransformer(self._model_name)
-            print(f"[SemanticMemory] Loaded embedding model: {self._model_name}")
+            device = self._detect_device()
+            if self._backend == "onnx":
+                self._model, device = self._load_onnx(SentenceTransformer, device)
+            if self._model is None:
+                self._model = SentenceTransformer(self._model_name, device=device)
+            self._dim = self._model.get_sentence_embedding_dimension() or EMBEDDING_DIM
+            logger.info(
+                "Loaded embedding model: %s on %s (%d-dim)", self._model_name, device, self._dim
+            )
+            if self._dim != EMBEDDING_DIM:
+                logger.warning(
+                    "Model dimension %d does not match the semantic_memory column (%d); "
+                    "migrate the column to halfvec(%d) before writing.",
+                    self._dim,
+                    EMBEDDING_DIM,
+                    self._dim,
+                )
         except ImportError:
-            print(
-                "[SemanticMemory] sentence-transformers not installed. "
+            logger.warning(
+                "sentence-transformers not installed. "
                 "Embeddings will use random vectors (development only)."
             )
         except Exception as e:
-            print(f"[SemanticMemory] Failed to load model: {e}. Using random vectors.")
+            logger.warning("Failed to load model: %s. Using random vectors.", e)
+
+    def _load_onnx(self, model_cls, device: str) -> tuple[Optional[Any], str]:
+        """
+        Load the model on the ONNX Runtime backend (needs optimum[onnxruntime]).
 
-    def _embed(self, text: str) -> list[float]:
-        """Generate an embedding vector for the given text."""
+        The FP32 export runs on the CUDA provider when torch sees a GPU and
+        onnxruntime has CUDAExecutionProvider; otherwise (including mps, which
+        ONNX Runtime does not target) the int8 dynamically quantized export
+        runs on the CPU. Returns the model and the device it actually runs on,
+        or (None, device) on failure so the caller falls back to PyTorch.
+        """
+        try:
+            import onnxruntime
+
+            if device == "cuda":
+                if "CUDAExecutionProvider" in onnxruntime.get_available_providers():
+                    return model_cls(self._model_name, device="cuda", backend="onnx"), "cuda"
+                logger.warning(
+                    "onnxruntime has no CUDAExecutionProvider; using the int8 CPU export"
+                )
+            model = model_cls(
+                self._model_name,
+                device="cpu",
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_QUANTIZED_FILE},
+            )
+            return model, "cpu"
+        except Exception as e:
+            logger.warning("ONNX backend unavailable: %s. Using PyTorch.", e)
+            return None, device
+
+    @staticmethod
+    def _detect_device() -> str:
+        """Pick the fastest available torch device: cuda, then mps, then cpu."""
+        try:
+            import torch
+
+            if torch.cuda.is_available():
+                return "cuda"
+            if torch.backends.mps.is_available():
+                return "mps"
+        except Exception:
+            pass
+        return "cpu"
+
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        """Content-address a text for the embedding cache."""
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look up a cached embedding, marking it most recently used."""
+        cached = self._emb_cache.get(key)
+        if cached is not None:
+            self._emb_cache.move_to_end(key)
+        return cached
+
+    def _cache_put(self, key: bytes, embedding: np.ndarray) -> np.ndarray:
+        """
+        Store an embedding, evicting the least recently used beyond the cap.
+
+        Returns the cached array, which owns its data: a row view into an
+        encode() batch would keep the whole batch buffer alive, so the cap
+        would bound entries but not memory.
+        """
+        if embedding.base is not None:
+            embedding = embedding.copy()
+        embedding.setflags(write=False)
+        self._emb_cache[key] = embedding
+        if len(self._emb_cache) > EMBED_CACHE_SIZE:
+            self._emb_cache.popitem(last=False)
+        return embedding
+
+    def _embed(self, text: str) -> np.ndarray:
+        """
+        Generate a float32 embedding vector for the given text.
+
+        Model embeddings are deterministic, so they are cached by content hash
+        and never need invalidating; cached arrays are read-only so callers
+        cannot mutate them.
+        """
+        key = self._cache_key(text)
         if self._model is not None:
-            embedding = self._model.encode(text, normalize_embeddings=True)
-            # Pad or truncate to 1536 dimensions to match schema
-            vec = embedding.tolist()
-            if len(vec) < 1536:
-                vec.extend([0.0] * (1536 - len(vec)))
-            elif len(vec) > 1536:
-                vec = vec[:1536]
-            return vec
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+            embedding = self._model.encode(
+                text, normalize_embeddings=True, convert_to_numpy=True
+            )
+            return self._cache_put(key, embedding)
         else:
-            # Fallback: random vector for development
-            rng = np.random.default_rng()
-            vec = rng.standard_normal(1536).tolist()
-            norm = float(np.linalg.norm(vec))
-            return [v / norm for v in vec]
+            # Fallback: random unit vector for development, seeded by the
+            # content hash so the same text always maps to the same vector
+            rng = np.random.default_rng(int.from_bytes(key, "big"))
+            vec = rng.standard_normal(self._dim, dtype=np.float32)
+            vec /= np.linalg.norm(vec)
+            return vec
+
+    def _embed_many(self, texts: list[str]) -> list[np.ndarray]:
+        """
+        Embed many texts, encoding only those not already cached.
+
+        Cache misses are deduplicated and encoded together in one batch,
+        then merged back with the hits in input order.
+        """
+        if self._model is None:
+            return [self._embed(text) for text in texts]
+
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = [self._cache_get(key) for key in keys]
+
+        misses: dict[bytes, str] = {}
+        for key, text, embedding in zip(keys, texts, embeddings):
+            if embedding is None:
+                misses.setdefault(key, text)
+        if not misses:
+            return embeddings
+
+        computed = {}
+        for key, embedding in zip(misses, self._embed_batch(list(misses.values()))):
+            computed[key] = self._cache_put(key, embedding)
+
+        return [
+            embedding if embedding is not None else computed[key]
+            for key, embedding in zip(keys, embeddings)
+        ]
+
+    def _embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        """
+        Generate embeddings for many texts with a single encode() call.
+
+        Batching amortizes the transformer forward pass across texts instead
+        of paying one model invocation per string. encode() already does
+        SBERT smart batching, sorting texts by length before splitting them
+        into mini-batches and restoring input order afterwards, so mixed
+        transcript chunks are padded only to their neighbours' length; the
+        texts must be passed as one list for that to apply.
+        """
+        if self._model is None:
+            return [self._embed(text) for text in texts]
+
+        embeddings = self._model.encode(
+            texts,
+            batch_size=EMBED_BATCH_SIZE,
+            show_progress_bar=False,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        return list(embeddings)
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a search query, reusing the embedding of a previously seen query.
+
+        Queries are normalized (lowercased, whitespace collapsed) before
+        embedding, so trivially different phrasings share one cache entry.
+        """
+        return self._embed(" ".join(query.lower().split()))
 
     async def search(
         self,
@@ -64,41 +275,40 @@ class SemanticMemory:
         Perform cosine similarity search against semantic memory.
         Returns the top-k most similar memories.
         """
-        query_embedding = self._embed(query)
-        embedding_str = "[" + ",".join(str(v) for v in query_embedding) + "]"
+        return await self.search_by_embedding(
+            agent_id=agent_id,
+            query_embedding=self._embed_query(query),
+            owner=owner,
+            limit=limit,
+        )
 
-        sql = """
-            SELECT id, content, metadata,
-                   1 - (embedding <=> $1::vector) AS similarity
-            FROM semantic_memory
-            WHERE agent_id = $2
+    async def search_by_embedding(
+        self,
+        agent_id: str,
+        query_embedding,
+        owner: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[dict]:
         """
-        params = [embedding_str, agent_id]
+        Cosine similarity search for an already-computed query embedding.
 
-        if owner:
-            sql += " AND owner = $3"
-            params.append(owner)
-
-        limit_pos = len(params) + 1
-        sql += f"""
-            ORDER BY embedding <=> $1::vector
-            LIMIT ${limit_pos}
+        Lets callers reuse one embedding across several searches; search()
+        is this plus the cached query embedding.
         """
-        params.append(limit)
-
-        rows = await db.fetch_all(sql, *params)
+        if owner:
+            rows = await db.fetch_all(
+                SEARCH_OWNER_SQL, query_embedding, agent_id, owner, limit
+            )
+        else:
+            rows = await db.fetch_all(SEARCH_SQL, query_embedding, agent_id, limit)
 
         results = []
         for row in rows:
-            meta = row["metadata"]
-            if isinstance(meta, str):
-                meta = json.loads(meta)
-
             results.append(
                 {
                     "id": str(row["id"]),
                     "content": row["content"],
-                    "metadata": meta,
+                    "metadata": row["metadata"],
                     "similarity": float(row["similarity"]),
                 }
             )
@@ -117,22 +327,49 @@ class SemanticMemory:
         Generates an embedding and stores in pgvector.
         Returns the memory ID.
         """
-        memory_id = str(uuid.uuid4())
-        embedding = self._embed(content)
-        embedding_str = "[" + ",".join(str(v) for v in embedding) + "]"
-
-        await db.execute(
-            """
-            INSERT INTO semantic_memory (id, agent_id, content, embedding, metadata, owner)
-            VALUES ($1, $2, $3, $4::vector, $5::jsonb, $6)
-            """,
-            memory_id,
+        memory_ids = await self.write_many(
             agent_id,
-            content,
-            embedding_str,
-            json.dumps(metadata or {}),
-            owner,
+            [{"content": content, "metadata": metadata, "owner": owner}],
         )
+        return memory_ids[0]
 
-        print(f"[SemanticMemory] Wrote memory {memory_id} for agent {agent_id}")
-        return memory_id
+    async def write_many(self, agent_id: str, items: list[dict]) -> list[str]:
+        """
+        Write many semantic memory entries for an agent.
+
+        Each item has "content" and optional "metadata" and "owner" keys.
+        All contents are embedded in one batch, then inserted atomically:
+        executemany for ordinary batches, binary COPY for bulk ingests of
+        COPY_THRESHOLD rows or more. Returns the memory IDs in input order.
+        """
+        if not items:
+            return []
+
+        embeddings = self._embed_many([item["content"] for item in items])
+
+        memory_ids = []
+        rows = []
+        for item, embedding in zip(items, embeddings):
+            memory_id = str(uuid.uuid4())
+            memory_ids.append(memory_id)
+            rows.append(
+                (
+                    memory_id,
+                    agent_id,
+                    item["content"],
+                    embedding,
+                    item.get("metadata") or {},
+                    item.get("owner", "company"),
+                )
+            )
+
+        if len(rows) >= COPY_THRESHOLD:
+            await db.copy_records("semantic_memory", rows, columns=INSERT_COLUMNS)
+        else:
+            await db.execute_many(INSERT_SQL, rows)
+
+        if len(memory_ids) == 1:
+            logger.info("Wrote memory %s for agent %s", memory_ids[0], agent_id)
+        else:
+            logger.info("Wrote %d memories for agent %s", len(memory_ids), agent_id)
+        return memory_ids
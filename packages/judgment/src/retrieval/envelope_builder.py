@@ -5,13 +5,67 @@ Called by the TypeScript runtime via the /envelope/build API endpoint.
 Assembles expert judgment, relevant memories, and org context.
 """
 
-import json
+import logging
 from typing import Any, Optional
 
 from ..memory.core import CoreMemory
 from ..memory.semantic import SemanticMemory
 from ..db.supabase import db
 
+logger = logging.getLogger(__name__)
+
+# Company-owned knowledge graph nodes, grouped by type into JSONB arrays
+# (NULL when a type has no nodes) so a single row comes back.
+ORG_CONTEXT_SQL = """
+    SELECT jsonb_agg(properties) FILTER (WHERE node_type = 'decision') AS decisions,
+           jsonb_agg(properties) FILTER (WHERE node_type = 'person') AS people,
+           jsonb_agg(properties) FILTER (WHERE node_type = 'project') AS projects
+    FROM kg_nodes
+    WHERE company_id = $1
+      AND owner = 'company'
+      AND archived = false
+      AND node_type IN ('decision', 'person', 'project')
+"""
+
+# Confidence bands for an agent with no core memory yet
+UNTRAINED_CONFIDENCE_MAP = (
+    {"min": 0.0, "max": 0.3, "action": "escalate", "description": "Low"},
+    {"min": 0.3, "max": 0.7, "action": "slow_down", "description": "Medium"},
+    {"min": 0.7, "max": 1.0, "action": "act", "description": "High"},
+)
+
+# Memories attached to the envelope as history
+HISTORY_LIMIT = 5
+
+
+def _untrained_judgment() -> dict[str, Any]:
+    """ExpertJudgment shape for an agent that has not been trained."""
+    return {
+        "expertId": "",
+        "version": "untrained",
+        "patterns": [],
+        "escalationTriggers": [],
+        "hardConstraints": [],
+        "confidenceMap": list(UNTRAINED_CONFIDENCE_MAP),
+    }
+
+
+def _expert_judgment(cm: dict[str, Any]) -> dict[str, Any]:
+    """
+    ExpertJudgment shape for a CoreMemory.load() record.
+
+    load() always returns every key, so fields are indexed directly; only
+    the free-form judgment blob may lack "patterns".
+    """
+    return {
+        "expertId": cm["expert_id"],
+        "version": cm["training_version"],
+        "patterns": cm["judgment_json"].get("patterns", []),
+        "escalationTriggers": cm["escalation_triggers"],
+        "hardConstraints": cm["hard_constraints"],
+        "confidenceMap": cm["confidence_map"],
+    }
+
 
 class EnvelopeBuilder:
     """Build the judgment portion of a TaskEnvelope."""
@@ -41,49 +95,30 @@ class EnvelopeBuilder:
 
         if cm is None:
             # Agent has not been trained — return empty judgment
-            expert_judgment = {
-                "expertId": "",
-                "version": "untrained",
-                "patterns": [],
-                "escalationTriggers": [],
-                "hardConstraints": [],
-                "confidenceMap": [
-                    {"min": 0.0, "max": 0.3, "action": "escalate", "description": "Low"},
-                    {"min": 0.3, "max": 0.7, "action": "slow_down", "description": "Medium"},
-                    {"min": 0.7, "max": 1.0, "action": "act", "description": "High"},
-                ],
-            }
+            expert_judgment = _untrained_judgment()
         else:
-            judgment_json = cm.get("judgment_json", {})
-            patterns = judgment_json.get("patterns", [])
-
-            expert_judgment = {
-                "expertId": cm.get("expert_id", ""),
-                "version": cm.get("training_version", ""),
-                "patterns": patterns,
-                "escalationTriggers": cm.get("escalation_triggers", []),
-                "hardConstraints": cm.get("hard_constraints", []),
-                "confidenceMap": cm.get("confidence_map", []),
-            }
+            expert_judgment = _expert_judgment(cm)
 
         # Step 2: Retrieve relevant episodic memories (company scope only)
         relevant_memories = await semantic_memory.search(
             agent_id=agent_id,
             query=task_spec,
             owner="company",
-            limit=5,
+            limit=HISTORY_LIMIT,
         )
 
         history = []
+        history_append = history.append
         for mem in relevant_memories:
-            history.append(
+            metadata = mem["metadata"] or {}
+            history_append(
                 {
-                    "sessionId": mem.get("metadata", {}).get("session_id", ""),
-                    "summary": mem.get("content", "")[:200],
+                    "sessionId": metadata.get("session_id", ""),
+                    "summary": mem["content"][:200],
                     "outcome": "",
-                    "timestamp": mem.get("metadata", {}).get("created_at", ""),
+                    "timestamp": metadata.get("created_at", ""),
                     "sentiment": 0.0,
-                    "relevanceScore": mem.get("similarity", 0.0),
+                    "relevanceScore": mem["similarity"],
                 }
             )
 
@@ -99,59 +134,51 @@ class EnvelopeBuilder:
     async def _build_org_context(self, company_id: str) -> dict[str, Any]:
         """Build org context from the knowledge graph."""
         try:
-            # Switch to unified kg_nodes store with owner filter
-            rows = await db.fetch_all(
-                """
-                SELECT node_type AS entity_type, properties AS entity_data
-                FROM kg_nodes
-                WHERE company_id = $1 AND owner = 'company' AND archived = false
-                """,
-                company_id,
-            )
+            # Group nodes by type in one aggregate row instead of one row per node
+            row = await db.fetch_one(ORG_CONTEXT_SQL, company_id)
         except Exception as e:
-            print(f"[EnvelopeBuilder] Failed to query org graph: {e}")
+            logger.warning("Failed to query org graph: %s", e)
             return self._empty_org_context()
 
-        if not rows:
+        if row is None:
             return self._empty_org_context()
 
-        decisions = []
-        people = []
+        decision_nodes = row["decisions"] or []
+        person_nodes = row["people"] or []
+        project_nodes = row["projects"] or []
+
+        if not (decision_nodes or person_nodes or project_nodes):
+            return self._empty_org_context()
+
+        decisions = [
+            {
+                "id": d.get("id", ""),
+                "title": d.get("title", ""),
+                "description": d.get("description", ""),
+                "status": d.get("status", "proposed"),
+                "stakeholders": d.get("stakeholders", []),
+                "deadline": d.get("deadline"),
+            }
+            for d in decision_nodes
+        ]
+        people = [
+            {
+                "id": p.get("id", ""),
+                "name": p.get("name", "Unknown"),
+                "role": p.get("role", ""),
+                "relevance": p.get("relevance", ""),
+                "contactPreference": p.get("contactPreference"),
+            }
+            for p in person_nodes
+        ]
+
         goal = ""
         constraints: list[str] = []
         budget = 0.0
-
-        for row in rows:
-            entity_type = row["entity_type"]
-            data = row["entity_data"]
-            if isinstance(data, str):
-                data = json.loads(data)
-
-            if entity_type == "decision":
-                decisions.append(
-                    {
-                        "id": data.get("id", ""),
-                        "title": data.get("title", ""),
-                        "description": data.get("description", ""),
-                        "status": data.get("status", "proposed"),
-                        "stakeholders": data.get("stakeholders", []),
-                        "deadline": data.get("deadline"),
-                    }
-                )
-            elif entity_type == "person":
-                people.append(
-                    {
-                        "id": data.get("id", ""),
-                        "name": data.get("name", "Unknown"),
-                        "role": data.get("role", ""),
-                        "relevance": data.get("relevance", ""),
-                        "contactPreference": data.get("contactPreference"),
-                    }
-                )
-            elif entity_type == "project":
-                goal = data.get("goal", goal)
-                constraints = data.get("constraints", constraints)
-                budget = data.get("budgetRemaining", budget)
+        for project in project_nodes:
+            goal = project.get("goal", goal)
+            constraints = project.get("constraints", constraints)
+            budget = project.get("budgetRemaining", budget)
 
         return {
             "goal": goal,
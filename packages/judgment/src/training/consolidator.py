@@ -76,13 +76,13 @@ class TrainingConsolidator:
         Currently implements ID and semantic overlap heuristics.
         """
         merged = list(existing)
-        existing_names = {p.get("name").lower(): i for i, p in enumerate(existing)}
-        
-        for p_new in new:
-            name_lower = p_new.get("name").lower()
-            if name_lower in existing_names:
+        append = merged.append
+        existing_names = {p["name"].lower(): i for i, p in enumerate(existing)}
+
+        for name_lower, p_new in [(p["name"].lower(), p) for p in new]:
+            idx = existing_names.get(name_lower)
+            if idx is not None:
                 # Deepen existing pattern
-                idx = existing_names[name_lower]
                 p_old = merged[idx]
                 p_old["description"] += f"\nDeepened: {p_new.get('description')}"
                 p_old["confidence"] = min(1.0, p_old.get("confidence", 0.5) + 0.1)
@@ -90,8 +90,9 @@ class TrainingConsolidator:
                 # Is it genuinely new or a contradiction?
                 # (Simple check for high semantic overlap but different recommendation)
                 # TODO: LLM-based contradiction detection
-                merged.append(p_new)
-                
+                existing_names[name_lower] = len(merged)
+                append(p_new)
+
         return merged
 
     def _consolidate_constraints(
@@ -99,13 +100,16 @@ class TrainingConsolidator:
     ) -> list[dict]:
         """Merge constraints, avoiding duplicates and checking for conflicts."""
         merged = list(existing)
-        existing_rules = {c.get("rule").lower(): i for i, c in enumerate(existing)}
-        
+        append = merged.append
+        existing_rules = {c["rule"].lower() for c in existing}
+        add_rule = existing_rules.add
+
         for c_new in new:
-            rule_lower = c_new.get("rule").lower()
+            rule_lower = c_new["rule"].lower()
             if rule_lower not in existing_rules:
-                merged.append(c_new)
-                
+                add_rule(rule_lower)
+                append(c_new)
+
         return merged
 
     def _consolidate_triggers(
@@ -113,12 +117,16 @@ class TrainingConsolidator:
     ) -> list[dict]:
         """Merge triggers."""
         merged = list(existing)
-        existing_desc = {t.get("description").lower() for t in existing}
-        
+        append = merged.append
+        existing_desc = {t["description"].lower() for t in existing}
+        add_desc = existing_desc.add
+
         for t_new in new:
-            if t_new.get("description").lower() not in existing_desc:
-                merged.append(t_new)
-                
+            desc_lower = t_new["description"].lower()
+            if desc_lower not in existing_desc:
+                add_desc(desc_lower)
+                append(t_new)
+
         return merged
 
     def _find_unresolved_contradictions(
@@ -6,11 +6,14 @@ core_memory table. Handles merging with existing judgments
 from previous training sessions.
 """
 
+import logging
 from typing import Any
 
 from .consolidator import TrainingConsolidator
 from ..memory.core import CoreMemory
 
+logger = logging.getLogger(__name__)
+
 
 class JudgmentEncoder:
     """Encode extracted judgment patterns into Core Memory."""
@@ -80,11 +83,12 @@ class JudgmentEncoder:
             confidence_map=confidence_map,
         )
 
-        print(
-            f"[JudgmentEncoder] Encoded judgment for agent {agent_id}: "
-            f"{len(merged_patterns)} patterns, "
-            f"{len(merged_constraints)} constraints, "
-            f"{len(merged_triggers)} triggers"
+        logger.info(
+            "Encoded judgment for agent %s: %d patterns, %d constraints, %d triggers",
+            agent_id,
+            len(merged_patterns),
+            len(merged_constraints),
+            len(merged_triggers),
         )
 
         return version_hash
@@ -10,17 +10,176 @@ Analyzes training session transcripts to identify:
 
 import hashlib
 import re
-from typing import Any
+from bisect import bisect_right
+from typing import Any, NamedTuple, Optional
+
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+
+class Matchers(NamedTuple):
+    """A category's fused indicators plus its literal prefilter tokens."""
+
+    folded: re.Pattern  # for pre-lowercased ASCII text
+    nocase: re.Pattern  # IGNORECASE, for everything else
+    tokens: tuple[str, ...]  # every indicator match contains one of these
+
+
+def _compile_any(indicators: tuple[str, ...], tokens: tuple[str, ...]) -> Matchers:
+    """
+    Compile lowercase indicator patterns into one fused alternation.
+
+    Fused at import, so each category costs one regex scan instead of one
+    per indicator. The plain variant runs over pre-lowercased ASCII text,
+    skipping per-character case folding; the IGNORECASE variant covers
+    non-ASCII transcripts, where lower() can change offsets.
+    """
+    fused = "|".join(f"(?:{p})" for p in indicators)
+    return Matchers(re.compile(fused), re.compile(fused, re.IGNORECASE), tokens)
+
+
+def _short_id(sentence: str) -> str:
+    """Opaque 8-hex-char ID for an extracted sentence (BLAKE2b, 4-byte digest)."""
+    return hashlib.blake2b(sentence.encode(), digest_size=4).hexdigest()
+
+
+def _sentence_id(sentence_ids: dict[int, str], i: int, sentence: str) -> str:
+    """ID of sentence i, encoded and hashed once even if several categories match it."""
+    sentence_id = sentence_ids.get(i)
+    if sentence_id is None:
+        sentence_id = sentence_ids[i] = _short_id(sentence)
+    return sentence_id
+
+
+def _sentence_starts(transcript: str) -> list[int]:
+    """
+    Start offsets of the segments re.split(_SENTENCE_SPLIT_RE) would produce.
+
+    Only offsets are kept; no segment strings are built. A segment's end is
+    looked up on demand, for sentences that actually match an indicator.
+    """
+    starts = [0]
+    starts.extend(match.end() for match in _SENTENCE_SPLIT_RE.finditer(transcript))
+    return starts
+
+
+def _matching_sentences(
+    matchers: Matchers, transcript: str, folded: Optional[str], starts: list[int]
+):
+    """
+    Yield (index, sentence) for each sentence containing an indicator match.
+
+    `folded` is the lowercased transcript when it is ASCII (same offsets),
+    else None to match case-insensitively on the original.
+
+    The regex scans the whole transcript rather than searching sentence by
+    sentence, and each match is mapped back to its segment by bisecting the
+    segment starts. No indicator can match across [.!?], so every match
+    lies inside one segment, and because each starts and ends on a word the
+    match also lies inside the stripped sentence, and the segment ends at
+    the first delimiter after the match. Once a sentence matches, the scan
+    resumes at the next segment: the rest of the sentence is never searched.
+    """
+    if folded is not None:
+        # Substring checks run at memory speed; a category none of whose
+        # tokens occur cannot match, so its regex scan is skipped
+        if not any(token in folded for token in matchers.tokens):
+            return
+        search, text = matchers.folded.search, folded
+    else:
+        search, text = matchers.nocase.search, transcript
+    find_boundary = _SENTENCE_SPLIT_RE.search
+
+    pos = 0
+    lo = 0  # sentences before this one are already behind the scan
+    while (match := search(text, pos)) is not None:
+        i = bisect_right(starts, match.start(), lo) - 1
+        boundary = find_boundary(transcript, match.end())
+        if boundary is None:
+            yield i, transcript[starts[i] :].strip()
+            return
+        yield i, transcript[starts[i] : boundary.start()].strip()
+        pos = boundary.end()
+        lo = i + 1
+
+
+# Sentences describing how the expert recognizes a situation
+_PATTERN_INDICATORS = (
+    r"when\s+(?:i|we)\s+see",
+    r"the\s+pattern\s+(?:is|here\s+is)",
+    r"(?:i|we)\s+always\s+(?:look\s+for|check)",
+    r"the\s+key\s+(?:thing|indicator|signal)\s+is",
+    r"(?:i|we)\s+(?:typically|usually|always)\s+(?:do|handle|approach)",
+)
+_PATTERN_MATCHERS = _compile_any(
+    _PATTERN_INDICATORS, ("when", "pattern", "always", "key", "typically", "usually")
+)
+
+# Sentences stating something the agent must never do
+_CONSTRAINT_INDICATORS = (
+    r"never\s+(?:do|say|send|share|disclose|reveal)",
+    r"(?:don't|do\s+not)\s+ever",
+    r"absolutely\s+(?:not|never|forbidden)",
+    r"(?:this|that)\s+is\s+(?:off\s+limits|forbidden|prohibited)",
+    r"under\s+no\s+circumstances",
+    r"(?:must|should)\s+never",
+)
+_CONSTRAINT_MATCHERS = _compile_any(
+    _CONSTRAINT_INDICATORS,
+    ("ever", "absolutely", "limits", "forbidden", "prohibited", "circumstances"),
+)
+
+# Sentences saying when to stop and involve a human
+_TRIGGER_INDICATORS = (
+    r"(?:call|contact|escalate\s+to)\s+(?:me|the\s+team|management)",
+    r"(?:if|when)\s+you(?:'re)?\s+(?:unsure|not\s+sure|uncertain)",
+    r"(?:stop|pause)\s+and\s+(?:ask|check|verify)",
+    r"this\s+needs\s+(?:human|manual)\s+(?:review|approval)",
+    r"(?:flag|alert)\s+(?:me|us|the\s+team)",
+)
+_TRIGGER_MATCHERS = _compile_any(
+    _TRIGGER_INDICATORS,
+    ("call", "contact", "escalate", "you", "stop", "pause", "needs", "flag", "alert"),
+)
+
+# Records kept per category; long transcripts repeat themselves, and later
+# refinement (the LLM step) only needs a representative set
+MAX_MATCHES = 256
+
+# Default confidence map — should be refined through training
+_DEFAULT_CONFIDENCE_MAP = (
+    {
+        "min": 0.0,
+        "max": 0.3,
+        "action": "escalate",
+        "description": "Low confidence — escalate to human",
+    },
+    {
+        "min": 0.3,
+        "max": 0.6,
+        "action": "slow_down",
+        "description": "Medium confidence — proceed with extra verification",
+    },
+    {
+        "min": 0.6,
+        "max": 1.0,
+        "action": "act",
+        "description": "High confidence — act autonomously",
+    },
+)
 
 
 class JudgmentExtractor:
     """Extract structured judgment from training transcripts."""
 
-    async def extract(self, transcript: str) -> dict[str, Any]:
+    async def extract(
+        self, transcript: str, max_matches: int = MAX_MATCHES
+    ) -> dict[str, Any]:
         """
         Extract judgment patterns, constraints, triggers, and confidence map
         from a training transcript.
 
+        Each category keeps at most `max_matches` records, one per distinct
+        sentence; scanning stops once a category is full.
+
         In production, this should use an LLM to analyze the transcript
         and extract structured judgment. The LLM prompt should be designed
         to identify:
@@ -33,9 +192,18 @@ class JudgmentExtractor:
         TODO: Replace with LLM-based extraction using Claude or GPT-4.
         Current implementation uses keyword-based heuristics as a scaffold.
         """
-        patterns = self._extract_patterns(transcript)
-        constraints = self._extract_constraints(transcript)
-        triggers = self._extract_triggers(transcript)
+        # Hashed first so the encoded copy is freed before the regex scans
+        raw_transcript_hash = hashlib.sha256(transcript.encode()).digest()[:8].hex()
+        # Segment once, as offsets; sentence text is sliced out only for
+        # matching sentences
+        starts = _sentence_starts(transcript)
+        # Lowercase once for matching; output text is still sliced from the
+        # original so it keeps its casing
+        folded = transcript.lower() if transcript.isascii() else None
+
+        patterns, constraints, triggers = self._extract_all(
+            transcript, folded, starts, max_matches
+        )
         confidence_map = self._extract_confidence_map(transcript)
 
         return {
@@ -43,127 +211,89 @@ class JudgmentExtractor:
             "constraints": constraints,
             "triggers": triggers,
             "confidence_map": confidence_map,
-            "raw_transcript_hash": hashlib.sha256(
-                transcript.encode()
-            ).hexdigest()[:16],
+            "raw_transcript_hash": raw_transcript_hash,
         }
 
-    def _extract_patterns(self, transcript: str) -> list[dict]:
+    def _extract_all(
+        self,
+        transcript: str,
+        folded: Optional[str],
+        starts: list[int],
+        max_matches: int,
+    ) -> tuple[list[dict], list[dict], list[dict]]:
         """
-        Extract domain-specific patterns from the transcript.
-
-        TODO: Replace with LLM-based extraction.
-        """
-        patterns = []
-
-        # Simple heuristic: look for sentences with pattern indicators
-        pattern_indicators = [
-            r"when\s+(?:I|we)\s+see",
-            r"the\s+pattern\s+(?:is|here\s+is)",
-            r"(?:I|we)\s+always\s+(?:look\s+for|check)",
-            r"the\s+key\s+(?:thing|indicator|signal)\s+is",
-            r"(?:I|we)\s+(?:typically|usually|always)\s+(?:do|handle|approach)",
-        ]
-
-        sentences = re.split(r"[.!?]+", transcript)
-        for i, sentence in enumerate(sentences):
-            sentence = sentence.strip()
-            if not sentence:
-                continue
+        Extract domain patterns, hard constraints (things the agent must never
+        do) and escalation triggers in one pass over the shared segmentation.
 
-            for indicator in pattern_indicators:
-                if re.search(indicator, sentence, re.IGNORECASE):
-                    pattern_id = hashlib.md5(sentence.encode()).hexdigest()[:8]
-                    patterns.append(
-                        {
-                            "id": f"pat_{pattern_id}",
-                            "name": f"Pattern from training (line {i + 1})",
-                            "description": sentence[:200],
-                            "responseGuidance": "",  # TODO: extract from context
-                            "domains": [],
-                            "confidence": 0.5,
-                        }
-                    )
-                    break
-
-        return patterns
-
-    def _extract_constraints(self, transcript: str) -> list[dict]:
-        """
-        Extract hard constraints (things the agent must never do).
+        Each category keeps its own scan: a single alternation across
+        categories would drop a match that overlaps another category's.
 
         TODO: Replace with LLM-based extraction.
         """
+        # Sentence IDs by sentence index, shared across the three categories
+        sentence_ids: dict[int, str] = {}
+        patterns = []
         constraints = []
+        triggers = []
 
-        constraint_indicators = [
-            r"never\s+(?:do|say|send|share|disclose|reveal)",
-            r"(?:don't|do\s+not)\s+ever",
-            r"absolutely\s+(?:not|never|forbidden)",
-            r"(?:this|that)\s+is\s+(?:off\s+limits|forbidden|prohibited)",
-            r"under\s+no\s+circumstances",
-            r"(?:must|should)\s+never",
-        ]
-
-        sentences = re.split(r"[.!?]+", transcript)
-        for i, sentence in enumerate(sentences):
-            sentence = sentence.strip()
-            if not sentence:
+        # Simple heuristic: look for sentences with each category's indicators.
+        # A sentence repeated verbatim has the same ID and is kept once.
+        seen: set[str] = set()
+        for i, sentence in _matching_sentences(_PATTERN_MATCHERS, transcript, folded, starts):
+            if len(patterns) >= max_matches:
+                break
+            pattern_id = _sentence_id(sentence_ids, i, sentence)
+            if pattern_id in seen:
                 continue
+            seen.add(pattern_id)
+            patterns.append(
+                {
+                    "id": f"pat_{pattern_id}",
+                    "name": f"Pattern from training (line {i + 1})",
+                    "description": sentence[:200],
+                    "responseGuidance": "",  # TODO: extract from context
+                    "domains": [],
+                    "confidence": 0.5,
+                }
+            )
 
-            for indicator in constraint_indicators:
-                if re.search(indicator, sentence, re.IGNORECASE):
-                    constraint_id = hashlib.md5(sentence.encode()).hexdigest()[:8]
-                    constraints.append(
-                        {
-                            "id": f"con_{constraint_id}",
-                            "description": sentence[:200],
-                            "rule": sentence[:200],
-                            "category": "operational",
-                            "critical": "never" in sentence.lower(),
-                        }
-                    )
-                    break
-
-        return constraints
-
-    def _extract_triggers(self, transcript: str) -> list[dict]:
-        """
-        Extract escalation triggers.
-
-        TODO: Replace with LLM-based extraction.
-        """
-        triggers = []
+        seen = set()
+        for i, sentence in _matching_sentences(_CONSTRAINT_MATCHERS, transcript, folded, starts):
+            if len(constraints) >= max_matches:
+                break
+            constraint_id = _sentence_id(sentence_ids, i, sentence)
+            if constraint_id in seen:
+                continue
+            seen.add(constraint_id)
+            constraints.append(
+                {
+                    "id": f"con_{constraint_id}",
+                    "description": sentence[:200],
+                    "rule": sentence[:200],
+                    "category": "operational",
+                    "critical": "never" in sentence.lower(),
+                }
+            )
 
-        trigger_indicators = [
-            r"(?:call|contact|escalate\s+to)\s+(?:me|the\s+team|management)",
-            r"(?:if|when)\s+you(?:'re)?\s+(?:unsure|not\s+sure|uncertain)",
-            r"(?:stop|pause)\s+and\s+(?:ask|check|verify)",
-            r"this\s+needs\s+(?:human|manual)\s+(?:review|approval)",
-            r"(?:flag|alert)\s+(?:me|us|the\s+team)",
-        ]
-
-        sentences = re.split(r"[.!?]+", transcript)
-        for i, sentence in enumerate(sentences):
-            sentence = sentence.strip()
-            if not sentence:
+        seen = set()
+        for i, sentence in _matching_sentences(_TRIGGER_MATCHERS, transcript, folded, starts):
+            if len(triggers) >= max_matches:
+                break
+            trigger_id = _sentence_id(sentence_ids, i, sentence)
+            if trigger_id in seen:
                 continue
+            seen.add(trigger_id)
+            triggers.append(
+                {
+                    "id": f"trg_{trigger_id}",
+                    "description": sentence[:200],
+                    "patterns": [sentence[:100].lower()],
+                    "action": "escalate",
+                    "priority": 5,
+                }
+            )
 
-            for indicator in trigger_indicators:
-                if re.search(indicator, sentence, re.IGNORECASE):
-                    trigger_id = hashlib.md5(sentence.encode()).hexdigest()[:8]
-                    triggers.append(
-                        {
-                            "id": f"trg_{trigger_id}",
-                            "description": sentence[:200],
-                            "patterns": [sentence[:100].lower()],
-                            "action": "escalate",
-                            "priority": 5,
-                        }
-                    )
-                    break
-
-        return triggers
+        return patterns, constraints, triggers
 
     def _extract_confidence_map(self, transcript: str) -> list[dict]:
         """
@@ -172,24 +302,4 @@ class JudgmentExtractor:
         TODO: Replace with LLM-based extraction from expert's
         descriptions of when they feel confident vs uncertain.
         """
-        # Default confidence map — should be refined through training
-        return [
-            {
-                "min": 0.0,
-                "max": 0.3,
-                "action": "escalate",
-                "description": "Low confidence — escalate to human",
-            },
-            {
-                "min": 0.3,
-                "max": 0.6,
-                "action": "slow_down",
-                "description": "Medium confidence — proceed with extra verification",
-            },
-            {
-                "min": 0.6,
-                "max": 1.0,
-                "action": "act",
-                "description": "High confidence — act autonomously",
-            },
-        ]
+        return list(_DEFAULT_CONFIDENCE_MAP)
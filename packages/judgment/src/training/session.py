@@ -9,6 +9,7 @@ Processes a training session transcript (text or audio):
 """
 
 import hashlib
+import logging
 from datetime import datetime, timezone
 
 from .voice import VoiceTranscriber
@@ -17,6 +18,10 @@ from .encoder import JudgmentEncoder
 from ..memory.core import CoreMemory
 from ..memory.semantic import SemanticMemory
 
+logger = logging.getLogger(__name__)
+
+_UTC = timezone.utc
+
 
 class TrainingSessionHandler:
     """Orchestrates the full training session pipeline."""
@@ -49,28 +54,26 @@ class TrainingSessionHandler:
         Returns:
             dict with training results
         """
-        print(
-            f"[TrainingSession] Processing session for agent {agent_id} "
-            f"by expert {expert_id}"
-        )
+        logger.info("Processing session for agent %s by expert %s", agent_id, expert_id)
 
         # Step 1: Transcribe if audio
         text = transcript
         if is_audio:
-            print("[TrainingSession] Transcribing audio input...")
+            logger.debug("Transcribing audio input")
             text = await self.transcriber.transcribe(transcript)
-            print(f"[TrainingSession] Transcribed {len(text)} characters")
+            logger.debug("Transcribed %d characters", len(text))
 
         # Step 2: Extract judgment patterns
-        print("[TrainingSession] Extracting judgment patterns...")
+        logger.debug("Extracting judgment patterns")
         extraction = await self.extractor.extract(text)
-        print(
-            f"[TrainingSession] Extracted {len(extraction['patterns'])} patterns, "
-            f"{len(extraction['constraints'])} constraints"
+        logger.info(
+            "Extracted %d patterns, %d constraints",
+            len(extraction["patterns"]),
+            len(extraction["constraints"]),
         )
 
         # Step 3: Encode into Core Memory
-        print("[TrainingSession] Encoding judgment into Core Memory...")
+        logger.debug("Encoding judgment into Core Memory")
         version_hash = await self.encoder.encode(
             agent_id=agent_id,
             expert_id=expert_id,
@@ -79,14 +82,14 @@ class TrainingSessionHandler:
         )
 
         # Step 4: Store transcript as semantic memory
-        print("[TrainingSession] Storing transcript as semantic memory...")
+        logger.debug("Storing transcript as semantic memory")
         await semantic_memory.write(
             agent_id=agent_id,
             content=text,
             metadata={
                 "type": "training_transcript",
                 "expert_id": expert_id,
-                "session_date": datetime.now(timezone.utc).isoformat(),
+                "session_date": datetime.now(_UTC).isoformat(timespec="seconds"),
                 "training_version": version_hash,
             },
             owner="expert",
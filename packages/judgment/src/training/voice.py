@@ -1,46 +1,118 @@
 """
 Voice Transcription — Whisper transcription stub.
 
-In production, uses OpenAI Whisper (local or API) to transcribe
+In production, uses Whisper (local faster-whisper, or API) to transcribe
 audio recordings of training sessions.
 """
 
+import asyncio
 import base64
-import tempfile
-import os
+import io
+import logging
+import math
+from typing import Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whisper models consume 16 kHz mono float32 samples
+WHISPER_SAMPLE_RATE = 16000
+
+
+def _decode_in_memory(audio_bytes: bytes) -> Optional[np.ndarray]:
+    """
+    Decode audio in process with libsndfile into 16 kHz mono float32.
+
+    Cheaper than a PyAV decode for the PCM formats libsndfile reads.
+    Returns None when that is not possible (soundfile missing, a container
+    libsndfile cannot read such as m4a/webm, or resampling needed without
+    scipy) so the caller falls back to Whisper's own decoder.
+    """
+    try:
+        import soundfile as sf
+
+        audio, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32")
+    except Exception:
+        return None
+
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1, dtype=np.float32)
+
+    if sample_rate != WHISPER_SAMPLE_RATE:
+        try:
+            from scipy.signal import resample_poly
+        except ImportError:
+            return None
+        g = math.gcd(sample_rate, WHISPER_SAMPLE_RATE)
+        audio = resample_poly(audio, WHISPER_SAMPLE_RATE // g, sample_rate // g)
+
+    return np.ascontiguousarray(audio, dtype=np.float32)
 
 
 class VoiceTranscriber:
     """Transcribe audio to text using Whisper."""
 
-    def __init__(self, model_name: str = "base"):
+    def __init__(self, model_name: str = "base", compute_type: str = "int8"):
         self._model_name = model_name
+        self._compute_type = compute_type
         self._model = None  # Lazy load
+        self._load_lock = asyncio.Lock()
 
-    def _load_model(self):
-        """Load the Whisper model on first use."""
+    async def _load_model(self):
+        """
+        Load the Whisper model on first use.
+
+        Serialized so concurrent sessions load it once, and run in a worker
+        thread so the multi-second load does not block the event loop.
+        """
         if self._model is not None:
             return
 
+        async with self._load_lock:
+            if self._model is None:
+                await asyncio.to_thread(self._load_model_sync)
+
+    def _load_model_sync(self):
         try:
-            import whisper
+            from faster_whisper import WhisperModel
 
-            self._model = whisper.load_model(self._model_name)
-            print(f"[VoiceTranscriber] Loaded Whisper model: {self._model_name}")
+            self._model = WhisperModel(
+                self._model_name, device="auto", compute_type=self._compute_type
+            )
+            logger.info(
+                "Loaded Whisper model: %s (%s)", self._model_name, self._compute_type
+            )
         except ImportError:
-            print(
-                "[VoiceTranscriber] openai-whisper not installed. "
-                "Audio transcription will return a stub."
+            logger.warning(
+                "faster-whisper not installed. Audio transcription will return a stub."
             )
         except Exception as e:
-            print(f"[VoiceTranscriber] Failed to load Whisper: {e}")
+            logger.warning("Failed to load Whisper: %s", e)
 
-    async def transcribe(self, audio_base64: str) -> str:
+    # The helpers below block for seconds and run in worker threads
+
+    def _transcribe(self, audio: Union[str, io.BytesIO, np.ndarray]) -> str:
+        """Run the model and join its segments; segments decode lazily."""
+        segments, _ = self._model.transcribe(audio)
+        return "".join(segment.text for segment in segments)
+
+    def _transcribe_bytes(self, audio_bytes: bytes) -> str:
+        audio = _decode_in_memory(audio_bytes)
+        if audio is None:
+            # Any other container is decoded in memory by faster-whisper (PyAV)
+            audio = io.BytesIO(audio_bytes)
+
+        return self._transcribe(audio)
+
+    async def transcribe(self, audio_base64: Union[str, bytes]) -> str:
         """
         Transcribe base64-encoded audio to text.
 
         Args:
-            audio_base64: Base64-encoded audio file content
+            audio_base64: Base64-encoded audio file content, as str or bytes.
+                Characters outside the base64 alphabet are discarded rather
+                than rejected, so callers must pass clean base64.
 
         Returns:
             Transcribed text
@@ -51,32 +123,25 @@ class VoiceTranscriber:
         - Chunking for long recordings (>30 min)
         - Language detection and multi-language support
         """
-        self._load_model()
+        await self._load_model()
 
         if self._model is None:
             # Stub: return placeholder text when Whisper is not available
-            print("[VoiceTranscriber] Whisper not available, returning stub transcript")
+            logger.warning("Whisper not available, returning stub transcript")
             return (
                 "[STUB TRANSCRIPT] Audio transcription is not available. "
-                "Install openai-whisper to enable voice training sessions. "
+                "Install faster-whisper to enable voice training sessions. "
                 f"Received {len(audio_base64)} characters of base64 audio."
             )
 
-        # Decode base64 audio to a temp file
         try:
-            audio_bytes = base64.b64decode(audio_base64)
+            if isinstance(audio_base64, str):
+                audio_base64 = audio_base64.encode("ascii")
+            audio_bytes = base64.b64decode(audio_base64, validate=False)
         except Exception as e:
             raise ValueError(f"Invalid base64 audio: {e}")
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp.write(audio_bytes)
-            tmp_path = tmp.name
-
-        try:
-            result = self._model.transcribe(tmp_path)
-            return result.get("text", "")
-        finally:
-            os.unlink(tmp_path)
+        return await asyncio.to_thread(self._transcribe_bytes, audio_bytes)
 
     async def transcribe_file(self, file_path: str) -> str:
         """
@@ -88,10 +153,9 @@ class VoiceTranscriber:
         Returns:
             Transcribed text
         """
-        self._load_model()
+        await self._load_model()
 
         if self._model is None:
             return "[STUB] Whisper not available"
 
-        result = self._model.transcribe(file_path)
-        return result.get("text", "")
+        return await asyncio.to_thread(self._transcribe, file_path)
@@ -0,0 +1,134 @@
+"""Tests for the json_body() request parsing and its OpenAPI schema."""
+
+import os
+
+os.environ.setdefault("SERVICE_TOKEN", "test-token")
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+import src.api.server as server
+
+JSON_BODY_ROUTES = {
+    "/envelope/build": "EnvelopeBuildRequest",
+    "/training/session": "TrainingSessionRequest",
+}
+
+
+@pytest.fixture
+def client():
+    # No lifespan: validation fails before any database or model access
+    return TestClient(server.app)
+
+
+@pytest.fixture
+def headers():
+    return {"X-Service-Token": server.SERVICE_TOKEN, "Content-Type": "application/json"}
+
+
+@pytest.fixture
+def fresh_openapi(monkeypatch):
+    """Regenerate the OpenAPI document, restoring the cached one afterwards."""
+    monkeypatch.setattr(server.app, "openapi_schema", None)
+    return server.app.openapi
+
+
+def _refs(node):
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "$ref":
+                yield value
+            else:
+                yield from _refs(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _refs(value)
+
+
+def _assert_refs_resolve(document):
+    schemas = document["components"]["schemas"]
+    for ref in _refs(document):
+        assert ref.startswith("#/components/schemas/"), ref
+        assert ref.rsplit("/", 1)[1] in schemas, ref
+
+
+class TestOpenAPI:
+    def test_json_body_models_are_components(self, fresh_openapi):
+        document = fresh_openapi()
+        schemas = document["components"]["schemas"]
+
+        for path, model_name in JSON_BODY_ROUTES.items():
+            body = document["paths"][path]["post"]["requestBody"]
+            assert body["required"] is True
+            assert body["content"]["application/json"]["schema"] == {
+                "$ref": f"#/components/schemas/{model_name}"
+            }
+            assert schemas[model_name]["title"] == model_name
+
+        assert set(schemas["EnvelopeBuildRequest"]["required"]) == {
+            "agent_id",
+            "task_spec",
+            "company_id",
+        }
+
+    def test_all_refs_resolve(self, fresh_openapi):
+        document = fresh_openapi()
+        _assert_refs_resolve(document)
+        assert "$defs" not in str(document)
+
+    def test_nested_models_are_merged_into_components(self, fresh_openapi, monkeypatch):
+        class Inner(BaseModel):
+            value: int
+
+        class Outer(BaseModel):
+            inner: Inner
+            items: list[Inner] = []
+
+        monkeypatch.setitem(server._JSON_BODY_MODELS, "Outer", Outer)
+        document = fresh_openapi()
+        schemas = document["components"]["schemas"]
+
+        assert schemas["Outer"]["properties"]["inner"] == {"$ref": "#/components/schemas/Inner"}
+        assert schemas["Inner"]["required"] == ["value"]
+        _assert_refs_resolve(document)
+
+
+class TestJsonBodyValidation:
+    @pytest.mark.parametrize("path", JSON_BODY_ROUTES)
+    @pytest.mark.parametrize("body", [b"{not json", b"", b'{"agent_id": "a",'])
+    def test_malformed_json_is_422(self, client, headers, path, body):
+        response = client.post(path, content=body, headers=headers)
+
+        assert response.status_code == 422
+        error = response.json()["detail"][0]
+        assert error["type"] == "json_invalid"
+        assert error["loc"][0] == "body"
+
+    def test_missing_field_is_422(self, client, headers):
+        response = client.post(
+            "/envelope/build", content=b'{"agent_id": "a", "task_spec": "t"}', headers=headers
+        )
+
+        assert response.status_code == 422
+        (error,) = response.json()["detail"]
+        assert error["type"] == "missing"
+        assert error["loc"] == ["body", "company_id"]
+
+    def test_wrong_type_is_422(self, client, headers):
+        response = client.post(
+            "/training/session",
+            content=b'{"agent_id": "a", "expert_id": "e", "transcript": "t", "is_audio": "maybe"}',
+            headers=headers,
+        )
+
+        assert response.status_code == 422
+        (error,) = response.json()["detail"]
+        assert error["type"] == "bool_parsing"
+        assert error["loc"] == ["body", "is_audio"]
+
+    def test_non_object_body_is_422(self, client, headers):
+        response = client.post("/envelope/build", content=b"[]", headers=headers)
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "model_type"
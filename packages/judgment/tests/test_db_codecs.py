@@ -0,0 +1,126 @@
+"""
+Round-trip tests for the binary codecs registered on pool connections.
+
+Expected bytes are built with struct from the documented wire layouts,
+independently of the encoders under test:
+
+- pgvector vector:  int16 dim, int16 unused, dim big-endian float32
+- pgvector halfvec: int16 dim, int16 unused, dim big-endian float16
+- jsonb:            version byte 1, then JSON text
+"""
+
+import asyncio
+import struct
+
+import numpy as np
+import orjson
+import pytest
+
+from src.db.supabase import (
+    Database,
+    _decode_halfvec,
+    _decode_jsonb,
+    _decode_vector,
+    _encode_halfvec,
+    _encode_jsonb,
+    _encode_vector,
+)
+
+# Exactly representable in float16, so halfvec round trips are exact
+VALUES = [0.0, 1.0, -1.0, 0.5, -0.25, 2.0, 65504.0, 0.000061035156]
+
+
+def _pgvector_bytes(fmt: str, values: list[float]) -> bytes:
+    return struct.pack(">HH", len(values), 0) + struct.pack(f">{len(values)}{fmt}", *values)
+
+
+@pytest.mark.parametrize(
+    "encode, decode, fmt",
+    [(_encode_vector, _decode_vector, "f"), (_encode_halfvec, _decode_halfvec, "e")],
+    ids=["vector", "halfvec"],
+)
+class TestPgvectorCodecs:
+    def test_encode_matches_wire_layout(self, encode, decode, fmt):
+        assert encode(VALUES) == _pgvector_bytes(fmt, VALUES)
+
+    def test_encode_accepts_ndarray(self, encode, decode, fmt):
+        little_endian = np.array(VALUES, dtype=np.float32)
+        assert encode(little_endian) == _pgvector_bytes(fmt, VALUES)
+
+    def test_decode_wire_layout(self, encode, decode, fmt):
+        decoded = decode(_pgvector_bytes(fmt, VALUES))
+        assert decoded.dtype == np.float32
+        assert decoded.dtype.isnative
+        assert decoded.tolist() == pytest.approx(VALUES)
+
+    def test_round_trip_embedding(self, encode, decode, fmt):
+        rng = np.random.default_rng(0)
+        embedding = rng.standard_normal(384).astype(np.float32)
+        embedding /= np.linalg.norm(embedding)
+
+        decoded = decode(encode(embedding))
+
+        assert decoded.shape == (384,)
+        # float16 keeps ~3 significant digits; float32 is exact
+        tolerance = 1e-3 if fmt == "e" else 0.0
+        np.testing.assert_allclose(decoded, embedding, atol=tolerance)
+
+    def test_empty(self, encode, decode, fmt):
+        assert encode([]) == b"\x00\x00\x00\x00"
+        assert decode(b"\x00\x00\x00\x00").shape == (0,)
+
+
+class TestJsonbCodec:
+    def test_encode_prefixes_version_byte(self):
+        assert _encode_jsonb({"a": [1, 2]}) == b'\x01{"a":[1,2]}'
+
+    def test_encode_passes_serialized_bytes_through(self):
+        document = orjson.dumps({"b": 1, "a": 2}, option=orjson.OPT_SORT_KEYS)
+        assert _encode_jsonb(document) == b"\x01" + document
+        assert _encode_jsonb(memoryview(document)) == b"\x01" + document
+
+    def test_decode_skips_version_byte(self):
+        assert _decode_jsonb(b'\x01{"k":"v","n":null}') == {"k": "v", "n": None}
+
+    def test_round_trip(self):
+        value = {"patterns": [{"id": "pat_1", "confidence": 0.5}], "text": "é — ✓"}
+        assert _decode_jsonb(_encode_jsonb(value)) == value
+
+
+class _FakeConnection:
+    """Records set_type_codec calls; answers the pg_type lookup."""
+
+    def __init__(self, types: dict[str, str]):
+        self._types = types
+        self.codecs: dict[str, dict] = {}
+
+    async def fetch(self, query, *args):
+        return [{"typname": name, "nspname": schema} for name, schema in self._types.items()]
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs[typename] = kwargs
+
+
+class TestInitConnection:
+    def test_registers_binary_codecs_in_extension_schema(self):
+        conn = _FakeConnection({"vector": "extensions", "halfvec": "extensions"})
+        asyncio.run(Database("postgres://unused")._init_connection(conn))
+
+        assert conn.codecs["jsonb"]["schema"] == "pg_catalog"
+        assert conn.codecs["vector"]["encoder"] is _encode_vector
+        assert conn.codecs["halfvec"]["decoder"] is _decode_halfvec
+        for typename in ("jsonb", "vector", "halfvec"):
+            assert conn.codecs[typename]["format"] == "binary"
+        assert conn.codecs["halfvec"]["schema"] == "extensions"
+
+    def test_skips_halfvec_on_old_pgvector(self):
+        conn = _FakeConnection({"vector": "public"})
+        asyncio.run(Database("postgres://unused")._init_connection(conn))
+
+        assert set(conn.codecs) == {"jsonb", "vector"}
+
+    def test_skips_vector_codecs_without_pgvector(self):
+        conn = _FakeConnection({})
+        asyncio.run(Database("postgres://unused")._init_connection(conn))
+
+        assert set(conn.codecs) == {"jsonb"}
@@ -0,0 +1,211 @@
+"""
+Tests for JudgmentExtractor's keyword scanner.
+
+The scanner fuses each category's indicators into one regex, scans the
+whole transcript once and maps matches back to sentences. Its output is
+pinned against a reference implementation of the straightforward
+algorithm: split into sentences, then search each sentence for each
+indicator, case-insensitively.
+"""
+
+import asyncio
+import hashlib
+import random
+import re
+
+import pytest
+
+from src.training.extractor import MAX_MATCHES, JudgmentExtractor
+
+_REFERENCE_INDICATORS = {
+    "patterns": [
+        r"when\s+(?:I|we)\s+see",
+        r"the\s+pattern\s+(?:is|here\s+is)",
+        r"(?:I|we)\s+always\s+(?:look\s+for|check)",
+        r"the\s+key\s+(?:thing|indicator|signal)\s+is",
+        r"(?:I|we)\s+(?:typically|usually|always)\s+(?:do|handle|approach)",
+    ],
+    "constraints": [
+        r"never\s+(?:do|say|send|share|disclose|reveal)",
+        r"(?:don't|do\s+not)\s+ever",
+        r"absolutely\s+(?:not|never|forbidden)",
+        r"(?:this|that)\s+is\s+(?:off\s+limits|forbidden|prohibited)",
+        r"under\s+no\s+circumstances",
+        r"(?:must|should)\s+never",
+    ],
+    "triggers": [
+        r"(?:call|contact|escalate\s+to)\s+(?:me|the\s+team|management)",
+        r"(?:if|when)\s+you(?:'re)?\s+(?:unsure|not\s+sure|uncertain)",
+        r"(?:stop|pause)\s+and\s+(?:ask|check|verify)",
+        r"this\s+needs\s+(?:human|manual)\s+(?:review|approval)",
+        r"(?:flag|alert)\s+(?:me|us|the\s+team)",
+    ],
+}
+
+
+def _reference_record(category: str, i: int, sentence: str) -> dict:
+    short_id = hashlib.blake2b(sentence.encode(), digest_size=4).hexdigest()
+    if category == "patterns":
+        return {
+            "id": f"pat_{short_id}",
+            "name": f"Pattern from training (line {i + 1})",
+            "description": sentence[:200],
+            "responseGuidance": "",
+            "domains": [],
+            "confidence": 0.5,
+        }
+    if category == "constraints":
+        return {
+            "id": f"con_{short_id}",
+            "description": sentence[:200],
+            "rule": sentence[:200],
+            "category": "operational",
+            "critical": "never" in sentence.lower(),
+        }
+    return {
+        "id": f"trg_{short_id}",
+        "description": sentence[:200],
+        "patterns": [sentence[:100].lower()],
+        "action": "escalate",
+        "priority": 5,
+    }
+
+
+def _reference_extract(transcript: str, max_matches: int = MAX_MATCHES) -> dict:
+    sentences = re.split(r"[.!?]+", transcript)
+    result = {}
+    for category, indicators in _REFERENCE_INDICATORS.items():
+        records = []
+        seen = set()
+        for i, sentence in enumerate(sentences):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if any(re.search(p, sentence, re.IGNORECASE) for p in indicators):
+                record = _reference_record(category, i, sentence)
+                if record["id"] not in seen and len(records) < max_matches:
+                    seen.add(record["id"])
+                    records.append(record)
+        result[category] = records
+    return result
+
+
+def _extract(transcript: str, **kwargs) -> dict:
+    return asyncio.run(JudgmentExtractor().extract(transcript, **kwargs))
+
+
+def _assert_matches_reference(transcript: str, **kwargs) -> None:
+    extraction = _extract(transcript, **kwargs)
+    expected = _reference_extract(transcript, **kwargs)
+    for category in ("patterns", "constraints", "triggers"):
+        assert extraction[category] == expected[category], (category, transcript)
+
+
+_PHRASES = [
+    "When I see a spike", "when we  see", "The pattern here is", "the pattern is",
+    "We always look for", "I always check", "the key signal is", "The KEY thing is",
+    "we usually handle", "I typically approach", "Never share", "never   disclose",
+    "don't ever", "Do not ever", "absolutely forbidden", "That is off limits",
+    "this is prohibited", "Under no circumstances", "must never", "should never",
+    "call me", "escalate to management", "contact the team", "if you're unsure",
+    "when you not sure", "If you uncertain", "stop and verify", "PAUSE AND ASK",
+    "this needs human review", "this needs manual approval", "flag us", "alert the team",
+    "the weather", "café İstanbul", "neverland", "I'm", "x",
+]
+_DELIMITERS = [".", "!", "?", "...", "?!", " ", "\n", ". ", ""]
+
+
+def _random_transcript(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 30)):
+        parts.append(" ".join(rng.choice(_PHRASES) for _ in range(rng.randint(1, 4))))
+        parts.append(rng.choice(_DELIMITERS))
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_reference_on_random_transcripts(seed):
+    rng = random.Random(seed)
+    for _ in range(250):
+        _assert_matches_reference(_random_transcript(rng))
+
+
+@pytest.mark.parametrize("max_matches", [0, 1, 3])
+def test_matches_reference_with_small_caps(max_matches):
+    rng = random.Random(100 + max_matches)
+    for _ in range(100):
+        _assert_matches_reference(_random_transcript(rng), max_matches=max_matches)
+
+
+@pytest.mark.parametrize(
+    "transcript",
+    [
+        "",
+        "...",
+        "Never.",
+        "never share it",  # no trailing delimiter
+        "First.. I always check the logs!?! Then stop and ask",
+        "  Call me   .\n\nWhen we see this, flag us?",
+        "I always check.I always check!",  # repeat with no space after the delimiter
+        "İ always check. I always check! ǅ call me.",  # lower() changes length
+    ],
+)
+def test_sentence_boundaries(transcript):
+    _assert_matches_reference(transcript)
+
+
+def test_one_record_per_sentence_with_overlapping_indicators():
+    # Two pattern indicators and two trigger indicators in one sentence
+    extraction = _extract("When I see errors I always check and call me, then flag us.")
+
+    assert len(extraction["patterns"]) == 1
+    assert len(extraction["triggers"]) == 1
+    # A sentence matched by several categories shares its ID suffix
+    pattern_id = extraction["patterns"][0]["id"].removeprefix("pat_")
+    assert extraction["triggers"][0]["id"] == f"trg_{pattern_id}"
+
+
+def test_line_numbers_count_empty_segments():
+    extraction = _extract("Intro... Hmm! I always check the logs.")
+    assert extraction["patterns"][0]["name"] == "Pattern from training (line 3)"
+
+
+def test_repeated_sentence_is_kept_once_per_category():
+    extraction = _extract("Never share passwords. " * 5 + "Never share keys.")
+
+    assert [c["description"] for c in extraction["constraints"]] == [
+        "Never share passwords",
+        "Never share keys",
+    ]
+
+
+def test_max_matches_caps_each_category_independently():
+    transcript = " ".join(
+        f"I always check item {n}. Never share secret {n}." for n in range(MAX_MATCHES + 50)
+    )
+    transcript += " Call me."
+
+    extraction = _extract(transcript)
+
+    assert len(extraction["patterns"]) == MAX_MATCHES
+    assert len(extraction["constraints"]) == MAX_MATCHES
+    assert len(extraction["triggers"]) == 1
+    # The first MAX_MATCHES distinct sentences, in transcript order
+    assert extraction["patterns"][-1]["description"] == f"I always check item {MAX_MATCHES - 1}"
+
+
+def test_duplicates_do_not_count_towards_the_cap():
+    transcript = "Call me. " * 10 + "Flag us. Alert the team."
+    extraction = _extract(transcript, max_matches=3)
+
+    assert [t["description"] for t in extraction["triggers"]] == [
+        "Call me",
+        "Flag us",
+        "Alert the team",
+    ]
+
+
+def test_raw_transcript_hash():
+    transcript = "I always check the logs. Never share passwords!"
+    expected = hashlib.sha256(transcript.encode()).hexdigest()[:16]
+    assert _extract(transcript)["raw_transcript_hash"] == expected
@@ -0,0 +1,126 @@
+"""Tests for SemanticMemory's embedding cache."""
+
+import sys
+
+import numpy as np
+import pytest
+
+from src.memory.semantic import ONNX_QUANTIZED_FILE, SemanticMemory
+
+DIM = 8
+
+
+class _FakeModel:
+    """Deterministic stand-in for SentenceTransformer.encode()."""
+
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(SemanticMemory._cache_key(text), "big")
+        vec = np.random.default_rng(seed).standard_normal(DIM, dtype=np.float32)
+        return vec / np.linalg.norm(vec)
+
+    def encode(self, sentences, **kwargs):
+        # Like the real encode(): one 2D array per call, and a row view of
+        # it for a single string
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+        self.encoded.extend(texts)
+        batch = np.stack([self._vector(text) for text in texts])
+        return batch[0] if isinstance(sentences, str) else batch
+
+
+def _memory() -> tuple[SemanticMemory, _FakeModel]:
+    memory = SemanticMemory()
+    model = _FakeModel()
+    memory._model = model
+    memory._dim = DIM
+    return memory, model
+
+
+def test_cached_batch_entries_own_their_data():
+    memory, _ = _memory()
+    memory._embed_many([f"chunk {n}" for n in range(64)])
+
+    assert len(memory._emb_cache) == 64
+    for entry in memory._emb_cache.values():
+        assert entry.base is None
+        assert not entry.flags.writeable
+
+
+def test_cached_single_entry_owns_its_data():
+    memory, _ = _memory()
+    embedding = memory._embed("a query")
+
+    assert embedding.base is None
+    assert memory._embed("a query") is embedding
+
+
+def test_embed_many_mixes_hits_and_misses_in_input_order():
+    memory, model = _memory()
+    memory._embed_many(["b", "d"])
+    model.encoded.clear()
+
+    texts = ["a", "b", "c", "a", "d", "e"]
+    embeddings = memory._embed_many(texts)
+
+    # Only distinct misses are encoded, in one batch
+    assert model.encoded == ["a", "c", "e"]
+    assert len(embeddings) == len(texts)
+    for text, embedding in zip(texts, embeddings):
+        np.testing.assert_array_equal(embedding, model._vector(text))
+    assert embeddings[0] is embeddings[3]
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr("src.memory.semantic.EMBED_CACHE_SIZE", 2)
+    memory, model = _memory()
+    memory._embed("a")
+    memory._embed("b")
+    memory._embed("a")  # refresh a
+    memory._embed("c")  # evicts b
+
+    model.encoded.clear()
+    memory._embed_many(["a", "b", "c"])
+    assert model.encoded == ["b"]
+
+
+class _FakeOnnxRuntime:
+    def __init__(self, providers: list[str]):
+        self._providers = providers
+
+    def get_available_providers(self) -> list[str]:
+        return self._providers
+
+
+class _RecordingModel:
+    def __init__(self, name, device, backend, model_kwargs=None):
+        self.device = device
+        self.file_name = (model_kwargs or {}).get("file_name")
+
+
+@pytest.mark.parametrize(
+    "device, providers, expected_device, quantized",
+    [
+        ("cuda", ["CUDAExecutionProvider", "CPUExecutionProvider"], "cuda", False),
+        ("cuda", ["CPUExecutionProvider"], "cpu", True),
+        ("mps", ["CoreMLExecutionProvider", "CPUExecutionProvider"], "cpu", True),
+        ("cpu", ["CPUExecutionProvider"], "cpu", True),
+    ],
+)
+def test_load_onnx_reports_the_device_it_uses(
+    monkeypatch, device, providers, expected_device, quantized
+):
+    monkeypatch.setitem(sys.modules, "onnxruntime", _FakeOnnxRuntime(providers))
+
+    model, used = SemanticMemory()._load_onnx(_RecordingModel, device)
+
+    assert used == expected_device
+    assert model.device == expected_device
+    assert (model.file_name == ONNX_QUANTIZED_FILE) is quantized
+
+
+def test_load_onnx_failure_falls_back(monkeypatch):
+    monkeypatch.setitem(sys.modules, "onnxruntime", None)  # import raises
+
+    assert SemanticMemory()._load_onnx(_RecordingModel, "cuda") == (None, "cuda")